@@ -0,0 +1,63 @@
+"""Число SQL-запросов на анонимный запрос ленты для разных сессий.
+
+Сравниваются бэкенды сессий и стандартный AuthenticationMiddleware
+с LazyAuthenticationMiddleware. Аноним приходит либо без куки, либо
+с устаревшей сессионной кукой.
+
+    python benchmarks/anonymous_queries.py
+"""
+from common import seed, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+BACKENDS = ('db', 'cached_db', 'signed_cookies')
+
+AUTH_MIDDLEWARES = {
+    'django': 'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'lazy': 'blogicum.middleware.LazyAuthenticationMiddleware',
+}
+
+
+def count_queries(stale_cookie):
+    client = Client()
+    if stale_cookie:
+        client.cookies[settings.SESSION_COOKIE_NAME] = 'stale-session-key'
+    with CaptureQueriesContext(connection) as context:
+        client.get('/')
+    session_queries = [
+        query for query in context.captured_queries
+        if 'FROM "django_session"' in query['sql']
+        or 'FROM "auth_user" WHERE' in query['sql']
+    ]
+    return len(context.captured_queries), len(session_queries)
+
+
+def main():
+    seed()
+    for backend in BACKENDS:
+        for name, auth_middleware in AUTH_MIDDLEWARES.items():
+            middleware = [
+                auth_middleware if 'AuthenticationMiddleware' in path
+                else path
+                for path in settings.MIDDLEWARE
+            ]
+            with override_settings(
+                SESSION_ENGINE=f'django.contrib.sessions.backends.{backend}',
+                MIDDLEWARE=middleware,
+            ):
+                for stale_cookie in (False, True):
+                    total, session = count_queries(stale_cookie)
+                    cookie = 'stale cookie' if stale_cookie else 'no cookie'
+                    print(
+                        f'{backend:15} {name:7} {cookie:13} '
+                        f'queries={total:<3} session/user={session}'
+                    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Задержка и пропускная способность страниц чтения: WSGI против ASGI.
+
+Режимы:
+  wsgi-sync  — синхронные view, потоки через django.test.Client;
+  asgi-sync  — синхронные view под ASGI (переход в поток на каждый запрос);
+  asgi-async — нативные async-view (ASYNC_VIEWS=True) под ASGI.
+
+Каждый режим запускается в отдельном процессе, так как выбор view
+происходит при импорте urls.
+
+    python benchmarks/async_views.py --concurrency 16 --requests 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MODES = {
+    'wsgi-sync': 'False',
+    'asgi-sync': 'False',
+    'asgi-async': 'True',
+}
+
+
+def get_urls(post):
+    return ['/', '/category/bench/', f'/posts/{post.pk}/']
+
+
+def run_wsgi(urls, concurrency, requests):
+    from django.test import Client
+
+    client = Client()
+
+    def request(number):
+        start = time.perf_counter()
+        client.get(urls[number % len(urls)])
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(request, range(requests)))
+
+
+async def run_asgi(urls, concurrency, requests):
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(number):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.get(urls[number % len(urls)])
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(request(i) for i in range(requests)))
+
+
+def run_mode(mode, concurrency, requests):
+    from common import seed, setup_django
+
+    setup_django()
+    urls = get_urls(seed())
+    start = time.perf_counter()
+    if mode == 'wsgi-sync':
+        latencies = run_wsgi(urls, concurrency, requests)
+    else:
+        latencies = asyncio.run(run_asgi(urls, concurrency, requests))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latencies)
+    print(json.dumps({
+        'rps': requests / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--mode', choices=MODES)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args.mode, args.concurrency, args.requests)
+        return
+    for mode, async_views in MODES.items():
+        output = subprocess.run(
+            [
+                sys.executable, __file__, '--mode', mode,
+                '--concurrency', str(args.concurrency),
+                '--requests', str(args.requests),
+            ],
+            env={**os.environ, 'ASYNC_VIEWS': async_views},
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f'{mode:11} {result["rps"]:8.1f} req/s  '
+            f'p50={result["p50_ms"]:7.1f} ms  p95={result["p95_ms"]:7.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Общая подготовка Django и тестовых данных для бенчмарков."""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+
+
+def setup_django():
+    """Настраивает Django; по умолчанию на временной SQLite-базе."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    if os.getenv('DB_ENGINE', 'sqlite3') == 'sqlite3':
+        os.environ.setdefault(
+            'DB_NAME', os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+        )
+    import django
+    django.setup()
+    from django.conf import settings
+    settings.ALLOWED_HOSTS = ['*']
+
+
+def seed(posts=100, comments_per_post=20):
+    """Создаёт схему и тестовые посты с комментариями, если их ещё нет."""
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Post, User
+
+    call_command('migrate', verbosity=0)
+    if Post.objects.exists():
+        return Post.objects.order_by('pk').first()
+    author = User.objects.create(username='bench')
+    category = Category.objects.create(
+        title='bench', description='bench', slug='bench'
+    )
+    Post.objects.bulk_create(
+        Post(
+            title=f'Post {i}', text='text ' * 50, pub_date=timezone.now(),
+            author=author, category=category,
+        )
+        for i in range(posts)
+    )
+    Comment.objects.bulk_create(
+        Comment(text='comment ' * 10, post=post, author=author)
+        for post in Post.objects.all()
+        for _ in range(comments_per_post)
+    )
+    return Post.objects.order_by('pk').first()
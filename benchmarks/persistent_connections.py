@@ -0,0 +1,64 @@
+"""Запросы в секунду к ленте с постоянными соединениями и пулом и без них.
+
+По умолчанию работает на временной SQLite-базе. Для PostgreSQL задайте
+DB_ENGINE=postgresql и POSTGRES_* — база будет заполнена тестовыми
+данными, поэтому используйте отдельную.
+
+    python benchmarks/persistent_connections.py --threads 8 --requests 200
+"""
+import argparse
+import threading
+import time
+
+from common import seed, setup_django
+
+setup_django()
+
+from django.db import connections  # noqa: E402
+from django.test import Client  # noqa: E402
+
+MODES = {
+    'no reuse': {'CONN_MAX_AGE': 0, 'POOL_SIZE': 0},
+    'persistent': {'CONN_MAX_AGE': 60, 'POOL_SIZE': 0},
+    'persistent+checks': {
+        'CONN_MAX_AGE': 60, 'POOL_SIZE': 0, 'CONN_HEALTH_CHECKS': True,
+    },
+    'pool': {'CONN_MAX_AGE': 0, 'POOL_SIZE': 8},
+}
+
+
+def worker(requests):
+    client = Client()
+    for _ in range(requests):
+        client.get('/')
+    connections.close_all()
+
+
+def run(threads, requests):
+    workers = [
+        threading.Thread(target=worker, args=(requests,))
+        for _ in range(threads)
+    ]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+    seed()
+    settings_dict = connections.databases['default']
+    for name, options in MODES.items():
+        settings_dict.update({'CONN_HEALTH_CHECKS': False, **options})
+        rps = run(args.threads, args.requests)
+        print(f'{name:18} {rps:8.1f} req/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Полнотекстовый поиск по индексу против перебора через icontains.
+
+    python benchmarks/search.py --posts 50000
+"""
+import argparse
+import random
+import time
+
+from common import seed, setup_django
+
+setup_django()
+
+from django.db.models import Q  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from blog.models import Category, Post, User  # noqa: E402
+from blog.search import rebuild_index, search_posts  # noqa: E402
+
+random.seed(1)
+WORDS = [
+    ''.join(random.choices('абвгдеёжзийклмнопрстуфхцчшщыэюя', k=7))
+    for _ in range(5000)
+]
+QUERIES = [WORDS[42], f'{WORDS[4999]} {WORDS[17]}', WORDS[1234][:4]]
+
+
+def fill(posts):
+    seed(posts=0, comments_per_post=0)
+    author = User.objects.first()
+    category = Category.objects.first()
+    random.seed(1)
+    Post.objects.bulk_create(
+        (
+            Post(
+                title=' '.join(random.choices(WORDS, k=4)),
+                text=' '.join(random.choices(WORDS, k=80)),
+                pub_date=timezone.now(), author=author, category=category,
+            )
+            for _ in range(posts)
+        ),
+        batch_size=1000,
+    )
+    rebuild_index()
+
+
+def icontains(queryset, query):
+    for word in query.split():
+        queryset = queryset.filter(
+            Q(title__icontains=word) | Q(text__icontains=word)
+        )
+    return queryset.order_by('-pub_date')
+
+
+def measure(search, query, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        queryset = search(Post.published.all(), query)
+        count = queryset.count()
+        list(queryset[:10])
+    return (time.perf_counter() - start) / repeat * 1000, count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=50000)
+    args = parser.parse_args()
+    fill(args.posts)
+    for query in QUERIES:
+        fts_ms, fts_count = measure(search_posts, query)
+        scan_ms, scan_count = measure(icontains, query)
+        print(
+            f'{query:22} index={fts_ms:8.1f} ms ({fts_count})  '
+            f'icontains={scan_ms:8.1f} ms ({scan_count})'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Сравнение пропускной способности SQLite с PRAGMA из settings и без них.
+
+Читатели выбирают ленту комментариев поста, писатели добавляют
+комментарии по одному в транзакции, как CommentCreateView.
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 2
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from blogicum.db.sqlite3.base import apply_pragmas  # noqa: E402
+
+POSTS = 100
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    apply_pragmas(connection, pragmas)
+    return connection
+
+
+def prepare(path, pragmas):
+    connection = connect(path, pragmas)
+    connection.execute(
+        'CREATE TABLE comment ('
+        'id INTEGER PRIMARY KEY, post_id INTEGER, text TEXT, created_at REAL)'
+    )
+    connection.execute('CREATE INDEX comment_post ON comment (post_id)')
+    connection.executemany(
+        'INSERT INTO comment (post_id, text, created_at) VALUES (?, ?, ?)',
+        ((i % POSTS, 'x' * 200, time.time()) for i in range(20000)),
+    )
+    connection.commit()
+    connection.close()
+
+
+def reader(path, pragmas, stop, stats):
+    connection = connect(path, pragmas)
+    post_id = 0
+    while not stop.is_set():
+        try:
+            connection.execute(
+                'SELECT id, text FROM comment WHERE post_id = ? '
+                'ORDER BY created_at DESC LIMIT 10',
+                (post_id % POSTS,),
+            ).fetchall()
+            stats['reads'] += 1
+        except sqlite3.OperationalError:
+            stats['errors'] += 1
+        post_id += 1
+    connection.close()
+
+
+def writer(path, pragmas, stop, stats):
+    connection = connect(path, pragmas)
+    post_id = 0
+    while not stop.is_set():
+        try:
+            with connection:
+                connection.execute(
+                    'INSERT INTO comment (post_id, text, created_at) '
+                    'VALUES (?, ?, ?)',
+                    (post_id % POSTS, 'y' * 200, time.time()),
+                )
+            stats['writes'] += 1
+        except sqlite3.OperationalError:
+            stats['errors'] += 1
+        post_id += 1
+    connection.close()
+
+
+def run(pragmas, readers, writers, duration):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite3')
+        prepare(path, pragmas)
+        stop = threading.Event()
+        stats = {'reads': 0, 'writes': 0, 'errors': 0}
+        threads = [
+            threading.Thread(target=reader, args=(path, pragmas, stop, stats))
+            for _ in range(readers)
+        ] + [
+            threading.Thread(target=writer, args=(path, pragmas, stop, stats))
+            for _ in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return {key: value / duration for key, value in stats.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+    profiles = {
+        'default': {},
+        'tuned': settings.DATABASES['default'].get('PRAGMAS', {}),
+    }
+    for name, pragmas in profiles.items():
+        result = run(pragmas, args.readers, args.writers, args.duration)
+        print(
+            f'{name:8} reads/s={result["reads"]:10.0f} '
+            f'writes/s={result["writes"]:8.0f} '
+            f'errors/s={result["errors"]:6.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Накладные расходы учёта просмотра поста на запрос.
+
+Меряет ViewCounter.add отдельно и вместе с периодическим flush()
+(один UPDATE ... CASE на пачку), усреднённым по запросам.
+
+    python benchmarks/view_counter.py --views 200000 --posts 1000
+"""
+import argparse
+import random
+import time
+
+from common import seed, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+
+from blog.models import Post  # noqa: E402
+from blog.view_counter import ViewCounter  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--views', type=int, default=200000)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--flush-interval', type=float, default=0.05)
+    args = parser.parse_args()
+    seed(posts=args.posts, comments_per_post=0)
+    settings.VIEW_COUNTS_FLUSH_INTERVAL = args.flush_interval
+    post_ids = list(Post.objects.values_list('id', flat=True))
+    views = [random.choice(post_ids) for _ in range(args.views)]
+
+    counter = ViewCounter()
+    start = time.perf_counter()
+    for post_id in views:
+        counter.add(post_id)
+    add_time = time.perf_counter() - start
+    counter.flush()
+
+    counter = ViewCounter()
+    flushes = 0
+    start = time.perf_counter()
+    for post_id in views:
+        if counter.add(post_id):
+            counter.flush()
+            flushes += 1
+    counter.flush()
+    total_time = time.perf_counter() - start
+
+    print(f'add():          {add_time / args.views * 1e6:6.2f} µs/view')
+    print(
+        f'add()+flush():  {total_time / args.views * 1e6:6.2f} µs/view '
+        f'({flushes + 1} flushes)'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,186 @@
-from django.contrib import admin
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.utils import unquote
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.functional import cached_property
 
-from blog.models import Category, Location, Post, Comment
+from blog.autocomplete import filter_by_prefix
+from blog.bulk import delete_posts_with_comments, update_posts
+from blog.deletion import schedule_deletion
+from blog.models import (
+    AutocompleteTerm, Category, Comment, DeletionJob, Location, Post, User
+)
+from blog.search import search_posts
 
 
 admin.site.empty_value_display = 'Не задано'
 
 
-class PostInLine(admin.StackedInline):
-    model = Post
-    extra = 0
+def estimate_count(queryset):
+    """Примерное число строк таблицы без полного COUNT(*)."""
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}'
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row else None
 
 
-class CategoryAdmin(admin.ModelAdmin):
-    inlines = (PostInLine,)
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор для больших таблиц.
+
+    Без фильтров число строк берётся из статистики БД; с фильтрами
+    считается не дальше ADMIN_EXACT_COUNT_LIMIT строк.
+    """
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        if not self.object_list.query.where:
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate > limit:
+                return estimate
+        return self.object_list[:limit + 1].count()
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """Фильтр по внешнему ключу с поиском через autocomplete админки.
+
+    Загружается только выбранное значение, а не все строки таблицы.
+    """
+
+    template = 'admin/blog/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+        self.app_label = field.model._meta.app_label
+        self.model_name = field.model._meta.model_name
+        self.field_name = field.name
+        self.autocomplete_url = reverse(
+            f'{model_admin.admin_site.name}:autocomplete'
+        )
+
+    def field_choices(self, field, request, model_admin):
+        if not self.lookup_val:
+            return []
+        try:
+            return field.get_choices(
+                include_blank=False,
+                limit_choices_to={'pk': self.lookup_val},
+            )
+        except (ValueError, ValidationError):
+            return []
+
+    def has_output(self):
+        return True
+
+
+class RelatedPostsMixin:
+    """Постраничный список постов объекта на странице изменения.
+
+    Список только для чтения и подгружается по запросу, а не строится
+    формами inline для каждого поста.
+    """
+
+    change_form_template = 'admin/blog/related_posts_change_form.html'
+    related_posts_field = None
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                '<path:object_id>/posts/',
+                self.admin_site.admin_view(self.related_posts_view),
+                name=f'{opts.app_label}_{opts.model_name}_posts',
+            ),
+        ] + super().get_urls()
+
+    def has_related_posts_permission(self, request, obj=None):
+        """Право смотреть и сам объект, и посты в админке."""
+        post_admin = self.admin_site._registry.get(Post)
+        return (
+            self.has_view_or_change_permission(request, obj)
+            and post_admin is not None
+            and post_admin.has_view_permission(request)
+        )
+
+    def render_change_form(self, request, context, *args, **kwargs):
+        context['show_related_posts'] = self.has_related_posts_permission(
+            request, kwargs.get('obj')
+        )
+        return super().render_change_form(request, context, *args, **kwargs)
+
+    def related_posts_view(self, request, object_id):
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not self.has_related_posts_permission(request, obj):
+            raise PermissionDenied
+        posts = (
+            Post.objects
+            .filter(**{self.related_posts_field: obj})
+            .select_related('author')
+            .only('title', 'pub_date', 'is_published', 'author__username')
+            .order_by('-pub_date')
+        )
+        paginator = EstimatedCountPaginator(
+            posts, settings.ADMIN_RELATED_POSTS_PER_PAGE
+        )
+        context = {
+            'opts': Post._meta,
+            'page_obj': paginator.get_page(request.GET.get('page')),
+        }
+        return TemplateResponse(
+            request, 'admin/blog/related_posts.html', context
+        )
+
+
+class PrefixSearchMixin:
+    """Поиск по префиксам слов из индекса автодополнения.
+
+    Им же пользуются фильтры и поля с автодополнением: в отличие
+    от icontains, поиск идёт по индексу и не зависит от регистра
+    кириллицы на SQLite.
+    """
+
+    autocomplete_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return filter_by_prefix(
+            queryset, self.autocomplete_kind, search_term
+        ), False
+
+
+class CategoryAdmin(PrefixSearchMixin, RelatedPostsMixin, admin.ModelAdmin):
+    autocomplete_kind = AutocompleteTerm.CATEGORY
+    related_posts_field = 'category'
+    search_fields = ('title',)
+    ordering = ('title',)
     list_display = (
         'title',
         'slug',
@@ -20,27 +188,204 @@ class CategoryAdmin(admin.ModelAdmin):
     )
 
 
-class LocationAdmin(admin.ModelAdmin):
-    inlines = (PostInLine,)
+class LocationAdmin(PrefixSearchMixin, RelatedPostsMixin, admin.ModelAdmin):
+    autocomplete_kind = AutocompleteTerm.LOCATION
+    related_posts_field = 'location'
+    search_fields = ('name',)
+    ordering = ('name',)
     list_display = (
         'name',
         'is_published',
     )
 
 
-class PostAdmin(admin.ModelAdmin):
-    search_fields = ('category', 'location', 'is_published',)
+class BackgroundDeleteMixin:
+    """Удаление фоновой задачей (blog.deletion) вместо каскада в запросе.
+
+    Страница подтверждения не собирает связанные объекты: их удалит
+    задача пакетами. Права на удаление связанных моделей проверяются
+    по cascade_lookups запросом exists().
+    """
+
+    # (модель, поля поиска связанных строк по удаляемым объектам)
+    cascade_lookups = ()
+
+    def get_perms_needed(self, objs, request):
+        perms_needed = set()
+        for model, lookups in self.cascade_lookups:
+            model_admin = self.admin_site._registry.get(model)
+            if model_admin is None or model_admin.has_delete_permission(
+                request
+            ):
+                continue
+            related = Q()
+            for lookup in lookups:
+                related |= Q(**{lookup: objs})
+            if model.objects.filter(related).exists():
+                perms_needed.add(model._meta.verbose_name)
+        return perms_needed
+
+    def get_deleted_objects(self, objs, request):
+        return (
+            [str(obj) for obj in objs],
+            {self.model._meta.verbose_name_plural: len(objs)},
+            self.get_perms_needed(objs, request),
+            [],
+        )
+
+    def delete_model(self, request, obj):
+        schedule_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            schedule_deletion(obj)
+
+
+class MoveToCategoryForm(forms.Form):
+
+    def __init__(self, *args, admin_site, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['category'] = forms.ModelChoiceField(
+            Category.objects.all(),
+            label='Категория',
+            widget=AutocompleteSelect(
+                Post._meta.get_field('category'), admin_site
+            ),
+        )
+
+
+class PostAdmin(BackgroundDeleteMixin, admin.ModelAdmin):
+    cascade_lookups = (
+        (Comment, ('post__in',)),
+    )
+    search_fields = ('title', 'text',)
     list_display = (
         'title',
         'pub_date',
         'author',
         'location',
         'is_published',
+        'views_count',
         'created_at',
     )
     list_display_links = ('title',)
     list_editable = ('is_published',)
-    list_filter = ('category', 'location', 'is_published',)
+    list_filter = (
+        ('category', AutocompleteFilter),
+        ('location', AutocompleteFilter),
+        'is_published',
+    )
+    list_select_related = ('author', 'location',)
+    autocomplete_fields = ('author', 'category', 'location',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = (
+        'publish',
+        'unpublish',
+        'move_to_category',
+        'delete_with_comments',
+    )
+
+    @property
+    def media(self):
+        return (
+            super().media
+            + AutocompleteSelect(
+                self.model._meta.get_field('category'), self.admin_site
+            ).media
+            + forms.Media(js=('blog/js/autocomplete_filter.js',))
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по полнотекстовому индексу постов вместо LIKE."""
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Штатное удаление собирает все каскадные объекты в память.
+        actions.pop('delete_selected', None)
+        return actions
+
+    def confirm_action(self, request, title, form=None):
+        """Промежуточная страница массового действия.
+
+        При выборе всех строк (select_across) действие заново
+        применяется к фильтрам списка, а не к переданным pk.
+        """
+        media = self.media
+        if form is not None:
+            media += form.media
+        context = {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'opts': self.model._meta,
+            'form': form,
+            'media': media,
+            'action': request.POST['action'],
+            'select_across': request.POST.get('select_across') == '1',
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(
+            request, 'admin/blog/bulk_action_confirmation.html', context
+        )
+
+    @admin.action(
+        description='Опубликовать выбранные публикации',
+        permissions=('change',),
+    )
+    def publish(self, request, queryset):
+        count = update_posts(queryset, is_published=True)
+        self.message_user(request, f'Опубликовано публикаций: {count}.')
+
+    @admin.action(
+        description='Снять с публикации выбранные публикации',
+        permissions=('change',),
+    )
+    def unpublish(self, request, queryset):
+        count = update_posts(queryset, is_published=False)
+        self.message_user(request, f'Снято с публикации: {count}.')
+
+    @admin.action(
+        description='Перенести выбранные публикации в категорию',
+        permissions=('change',),
+    )
+    def move_to_category(self, request, queryset):
+        form = MoveToCategoryForm(
+            request.POST if 'apply' in request.POST else None,
+            admin_site=self.admin_site,
+        )
+        if not form.is_valid():
+            return self.confirm_action(
+                request, 'Перенос публикаций в категорию', form
+            )
+        category = form.cleaned_data['category']
+        count = update_posts(queryset, category=category)
+        self.message_user(
+            request, f'Перенесено в «{category}» публикаций: {count}.'
+        )
+
+    @admin.action(
+        description='Удалить выбранные публикации с комментариями',
+        permissions=('delete',),
+    )
+    def delete_with_comments(self, request, queryset):
+        perms_needed = self.get_perms_needed(queryset, request)
+        if perms_needed:
+            self.message_user(
+                request,
+                'Нет прав на удаление: ' + ', '.join(sorted(perms_needed)),
+                messages.ERROR,
+            )
+            return None
+        if 'apply' not in request.POST:
+            return self.confirm_action(
+                request, 'Удаление публикаций с комментариями'
+            )
+        count = delete_posts_with_comments(queryset)
+        self.message_user(request, f'Удалено публикаций: {count}.')
 
 
 class CommentAdmin(admin.ModelAdmin):
@@ -52,7 +397,38 @@ class CommentAdmin(admin.ModelAdmin):
     )
 
 
+class BlogUserAdmin(BackgroundDeleteMixin, UserAdmin):
+    cascade_lookups = (
+        (Post, ('author__in',)),
+        (Comment, ('author__in', 'post__author__in')),
+    )
+
+
+class DeletionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        '__str__',
+        'status',
+        'deleted_rows',
+        'created_at',
+        'updated_at',
+    )
+    list_filter = ('status', 'kind',)
+    readonly_fields = (
+        'kind',
+        'object_id',
+        'status',
+        'deleted_rows',
+        'error',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Post, PostAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(DeletionJob, DeletionJobAdmin)
+admin.site.unregister(User)
+admin.site.register(User, BlogUserAdmin)
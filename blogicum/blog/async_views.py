@@ -0,0 +1,126 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Count
+from django.http import Http404
+from django.shortcuts import render
+from django.utils import timezone
+
+from blog.concurrency import db_call
+from blog.forms import CommentForm
+from blog.models import Category, Comment, Post
+from blog.view_counter import view_counter
+
+render_async = sync_to_async(render)
+
+
+def get_or_none(queryset, **kwargs):
+    return queryset.filter(**kwargs).first()
+
+
+def get_page_number(request):
+    try:
+        number = int(request.GET.get('page', 1))
+    except (TypeError, ValueError):
+        return 1
+    return max(number, 1)
+
+
+async def get_page(request, queryset):
+    """Аналог Paginator.get_page: число объектов и страница грузятся сразу."""
+    paginator = Paginator(queryset, settings.PAGINATED_BY)
+    number = get_page_number(request)
+    bottom = (number - 1) * paginator.per_page
+    paginator.count, object_list = await asyncio.gather(
+        db_call(queryset.count),
+        db_call(list, queryset[bottom:bottom + paginator.per_page]),
+    )
+    if number > paginator.num_pages:
+        number = paginator.num_pages
+        bottom = (number - 1) * paginator.per_page
+        object_list = await db_call(
+            list, queryset[bottom:bottom + paginator.per_page]
+        )
+    return Page(object_list, number, paginator)
+
+
+async def index(request):
+    """Асинхронная главная страница."""
+    posts = (
+        Post.published
+        .select_related(
+            'location',
+            'category',
+            'author'
+        )
+        .order_by('-pub_date')
+        .annotate(comment_count=Count('comments'))
+    )
+    context = {
+        'page_obj': await get_page(request, posts)
+    }
+    return await render_async(request, 'blog/index.html', context)
+
+
+async def post_detail(request, pk):
+    """Асинхронная страница поста: пост, комментарии и пользователь
+    загружаются одновременно.
+    """
+    post, comments, _ = await asyncio.gather(
+        db_call(
+            get_or_none,
+            Post.objects.select_related('location', 'category', 'author'),
+            pk=pk,
+        ),
+        db_call(
+            list,
+            Comment.objects
+            .filter(post_id=pk)
+            .select_related('author'),
+        ),
+        db_call(lambda: request.user.is_authenticated),
+    )
+    if post is None:
+        raise Http404
+    if post.author_id != request.user.pk and (
+        post.is_published is False
+        or post.category.is_published is False
+        or post.pub_date > timezone.now()
+    ):
+        raise Http404
+    if settings.VIEW_COUNTS and view_counter.add(post.pk):
+        await db_call(view_counter.flush)
+    context = {
+        'post': post,
+        'form': CommentForm(),
+        'comments': comments
+    }
+    return await render_async(request, 'blog/detail.html', context)
+
+
+async def category_posts(request, category_slug):
+    """Асинхронная страница категории."""
+    posts = Post.objects.filter(
+        category__slug=category_slug,
+        category__is_published=True,
+        is_published=True,
+        pub_date__lte=timezone.now()
+    )
+    category, page_obj = await asyncio.gather(
+        db_call(
+            get_or_none,
+            Category.objects,
+            slug=category_slug,
+            is_published=True,
+        ),
+        get_page(request, posts),
+    )
+    if category is None:
+        raise Http404
+    context = {
+        'category': category,
+        'page_obj': page_obj
+    }
+    return await render_async(request, 'blog/category.html', context)
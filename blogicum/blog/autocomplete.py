@@ -0,0 +1,198 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Exists, Min, OuterRef, Q
+from django.urls import reverse
+
+from blog.models import AutocompleteTerm, Category, Location, Post, User
+
+WORD_RE = re.compile(r'\w+')
+
+# Последний символ BMP: term < prefix + MAX_CHAR — верхняя граница
+# диапазона по индексу на SQLite.
+MAX_CHAR = '\uffff'
+
+
+def get_terms(label):
+    """Слова подписи в нижнем регистре, без повторов."""
+    return sorted(set(WORD_RE.findall(label.lower())))
+
+
+def get_label(kind, instance):
+    if kind == AutocompleteTerm.USER:
+        return instance.username
+    if kind == AutocompleteTerm.LOCATION:
+        return instance.name
+    return instance.title
+
+
+def get_kind(instance):
+    if isinstance(instance, Post):
+        return AutocompleteTerm.POST
+    if isinstance(instance, Category):
+        return AutocompleteTerm.CATEGORY
+    if isinstance(instance, Location):
+        return AutocompleteTerm.LOCATION
+    return AutocompleteTerm.USER
+
+
+def build_terms(kind, object_id, label):
+    return [
+        AutocompleteTerm(
+            term=term[:settings.MAXLENGTH],
+            kind=kind,
+            object_id=object_id,
+            label=label[:settings.MAXLENGTH],
+        )
+        for term in get_terms(label)
+    ]
+
+
+def index_object(instance):
+    """Перестраивает слова одного объекта после сохранения."""
+    kind = get_kind(instance)
+    unindex_object(kind, instance.pk)
+    AutocompleteTerm.objects.bulk_create(
+        build_terms(kind, instance.pk, get_label(kind, instance))
+    )
+
+
+def unindex_object(kind, object_id):
+    AutocompleteTerm.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild_index(batch_size=1000):
+    """Строит индекс автодополнения заново по всем объектам."""
+    AutocompleteTerm.objects.all().delete()
+    sources = (
+        (AutocompleteTerm.POST, Post.objects.values_list('id', 'title')),
+        (AutocompleteTerm.CATEGORY,
+         Category.objects.values_list('id', 'title')),
+        (AutocompleteTerm.USER, User.objects.values_list('id', 'username')),
+        (AutocompleteTerm.LOCATION,
+         Location.objects.values_list('id', 'name')),
+    )
+    for kind, rows in sources:
+        batch = []
+        for object_id, label in rows.iterator(chunk_size=batch_size):
+            batch.extend(build_terms(kind, object_id, label))
+            if len(batch) >= batch_size:
+                AutocompleteTerm.objects.bulk_create(batch)
+                batch = []
+        AutocompleteTerm.objects.bulk_create(batch)
+
+
+def get_urls(kind, object_ids, labels):
+    """Ссылки на видимые объекты; скрытые посты и категории отбрасываются."""
+    if kind == AutocompleteTerm.POST:
+        return {
+            pk: reverse('blog:post_detail', kwargs={'pk': pk})
+            for pk in Post.published
+            .filter(pk__in=object_ids)
+            .values_list('pk', flat=True)
+        }
+    if kind == AutocompleteTerm.CATEGORY:
+        return {
+            pk: reverse('blog:category_posts', kwargs={'category_slug': slug})
+            for pk, slug in Category.objects
+            .filter(pk__in=object_ids, is_published=True)
+            .values_list('pk', 'slug')
+        }
+    return {
+        object_id: reverse(
+            'blog:profile', kwargs={'username': labels[object_id]}
+        )
+        for object_id in object_ids
+    }
+
+
+def starts_with(prefix):
+    """Условие «слово начинается с prefix», использующее индекс по term.
+
+    На SQLite LIKE не использует индекс, а диапазон корректен при
+    двоичном сравнении строк. На PostgreSQL порядок диапазона зависит
+    от правил сортировки, поэтому там LIKE по индексу varchar_pattern_ops.
+    """
+    if connection.vendor == 'sqlite':
+        return Q(term__gte=prefix, term__lt=prefix + MAX_CHAR)
+    return Q(term__startswith=prefix)
+
+
+def visible_terms():
+    """Слова объектов, которые можно подсказывать.
+
+    Скрытые посты и категории отбрасываются в SQL, чтобы не занимать
+    места в срезе по limit. У местоположений нет своей страницы, их
+    слова нужны только для blog:lookup.
+    """
+    return AutocompleteTerm.objects.filter(
+        Q(
+            kind=AutocompleteTerm.POST,
+            object_id__in=Post.published.values('pk'),
+        )
+        | Q(
+            kind=AutocompleteTerm.CATEGORY,
+            object_id__in=Category.objects.filter(
+                is_published=True
+            ).values('pk'),
+        )
+        | Q(kind=AutocompleteTerm.USER)
+    )
+
+
+def suggest(query, limit):
+    """Подсказки по префиксу последнего слова запроса.
+
+    Остальные слова запроса должны быть префиксами слов той же
+    подписи. Все условия проверяются в SQL, и каждый объект
+    попадает в выдачу один раз, сколько бы его слов ни подошло.
+    """
+    words = WORD_RE.findall(query.lower())
+    if not words:
+        return []
+    *other_words, prefix = words
+    terms = visible_terms().filter(starts_with(prefix))
+    for word in other_words:
+        terms = terms.filter(Exists(
+            AutocompleteTerm.objects.filter(
+                starts_with(word),
+                kind=OuterRef('kind'),
+                object_id=OuterRef('object_id'),
+            )
+        ))
+    candidates = (
+        terms
+        .values('kind', 'object_id', 'label')
+        .annotate(first_term=Min('term'))
+        .order_by('first_term', 'label')
+        .values_list('kind', 'object_id', 'label')[:limit]
+    )
+    found = {}
+    for kind, object_id, label in candidates:
+        found.setdefault(kind, {})[object_id] = label
+    results = []
+    for kind, labels in found.items():
+        urls = get_urls(kind, list(labels), labels)
+        results.extend(
+            {'kind': kind, 'label': label, 'url': urls[object_id]}
+            for object_id, label in labels.items()
+            if object_id in urls
+        )
+    return sorted(results, key=lambda item: item['label'].lower())
+
+
+def filter_by_prefix(queryset, kind, query):
+    """Оставляет объекты, в подписи которых для каждого слова запроса
+    есть слово с таким префиксом.
+
+    Слова индекса хранятся в нижнем регистре, поэтому поиск не зависит
+    от регистра и для кириллицы на SQLite.
+    """
+    for word in WORD_RE.findall(query.lower()):
+        queryset = queryset.filter(pk__in=(
+            AutocompleteTerm.objects
+            .filter(starts_with(word), kind=kind)
+            .values('object_id')
+        ))
+    return queryset
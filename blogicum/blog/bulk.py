@@ -0,0 +1,61 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from blog.models import AutocompleteTerm, Comment, Post
+from blog.search import unindex_posts
+
+logger = logging.getLogger('blog.bulk')
+
+
+def iter_pk_chunks(queryset, chunk_size=None):
+    """Первичные ключи queryset пакетами по возрастанию pk.
+
+    Следующий пакет выбирается по pk > последнего, поэтому изменения
+    уже обработанных строк не сдвигают выборку.
+    """
+    chunk_size = chunk_size or settings.ADMIN_BULK_CHUNK_SIZE
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = None
+    while True:
+        chunk = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1]
+
+
+def raw_delete(queryset):
+    """DELETE одним запросом, без сборщика каскадов и сигналов."""
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_posts(post_ids):
+    """Удаляет посты вместе с комментариями и записями индексов."""
+    with transaction.atomic():
+        raw_delete(Comment.objects.filter(post_id__in=post_ids))
+        raw_delete(AutocompleteTerm.objects.filter(
+            kind=AutocompleteTerm.POST, object_id__in=post_ids
+        ))
+        unindex_posts(post_ids)
+        return raw_delete(Post.objects.filter(pk__in=post_ids))
+
+
+def update_posts(queryset, **values):
+    """UPDATE постов пакетами; возвращает число изменённых строк."""
+    total = 0
+    for chunk in iter_pk_chunks(queryset):
+        total += Post.objects.filter(pk__in=chunk).update(**values)
+        logger.info('Обновлено публикаций: %s', total)
+    return total
+
+
+def delete_posts_with_comments(queryset):
+    """Удаляет посты queryset пакетами; возвращает число удалённых."""
+    total = 0
+    for chunk in iter_pk_chunks(queryset):
+        total += delete_posts(chunk)
+        logger.info('Удалено публикаций: %s', total)
+    return total
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+MISSING = object()
+
+FAMILIES = ('categories', 'locations')
+
+STATS_KEY = 'stats:{family}:{kind}'
+
+
+def get_cache():
+    return caches[settings.BLOG_CACHE_ALIAS]
+
+
+def version_key(family):
+    return f'{family}:version'
+
+
+def get_version(family):
+    cache = get_cache()
+    version = cache.get(version_key(family))
+    if version is None:
+        cache.add(version_key(family), 1, None)
+        version = cache.get(version_key(family), 1)
+    return version
+
+
+def make_key(family, *parts):
+    """Ключ в пространстве имён семейства с его текущей версией."""
+    return ':'.join(
+        (family, f'v{get_version(family)}', *(str(part) for part in parts))
+    )
+
+
+def invalidate(*families):
+    """Сбрасывает все ключи семейств увеличением их версии.
+
+    Не cache.incr(): FileBasedCache пересохраняет ключ с TIMEOUT
+    по умолчанию, и версия истекала бы раньше закэшированных значений.
+    """
+    cache = get_cache()
+    for family in families:
+        cache.set(version_key(family), get_version(family) + 1, None)
+
+
+class CacheStats:
+    """Счётчики попаданий процесса, периодически сбрасываемые в кэш."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, family, kind):
+        with self._lock:
+            self._counts[family, kind] += 1
+            if (
+                time.monotonic() - self._flushed_at
+                < settings.BLOG_CACHE_STATS_FLUSH_INTERVAL
+            ):
+                return
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        self.flush(counts)
+
+    def flush(self, counts=None):
+        if counts is None:
+            with self._lock:
+                counts, self._counts = self._counts, Counter()
+        cache = get_cache()
+        for (family, kind), count in counts.items():
+            key = STATS_KEY.format(family=family, kind=kind)
+            cache.set(key, cache.get(key, 0) + count, None)
+
+    @staticmethod
+    def read():
+        """Суммарные hits/misses по семействам из общего кэша."""
+        cache = get_cache()
+        return {
+            family: {
+                kind: cache.get(STATS_KEY.format(family=family, kind=kind), 0)
+                for kind in ('hits', 'misses')
+            }
+            for family in FAMILIES
+        }
+
+
+stats = CacheStats()
+
+
+def lock_path(key):
+    name = hashlib.md5(key.encode()).hexdigest()
+    return os.path.join(settings.BLOG_CACHE_LOCK_DIR, f'{name}.lock')
+
+
+def acquire_lock(path):
+    """Атомарно создаёт файл блокировки.
+
+    Файл старше BLOG_CACHE_LOCK_TIMEOUT остался от упавшего процесса
+    и перехватывается.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for _ in range(2):
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                age = time.time() - os.path.getmtime(path)
+            except FileNotFoundError:
+                continue
+            if age < settings.BLOG_CACHE_LOCK_TIMEOUT:
+                return False
+            release_lock(path)
+    return False
+
+
+def release_lock(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def get_or_compute(family, parts, compute, timeout=DEFAULT_TIMEOUT):
+    """Значение из кэша или результат compute().
+
+    При промахе значение пересчитывает только один процесс: он берёт
+    файловую блокировку, остальные ждут готового значения
+    до BLOG_CACHE_LOCK_TIMEOUT секунд. Значения живут не дольше
+    timeout (по умолчанию TIMEOUT кэша), даже если версию не сбросили.
+    """
+    cache = get_cache()
+    key = make_key(family, *parts)
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        stats.record(family, 'hits')
+        return value
+    stats.record(family, 'misses')
+    path = lock_path(key)
+    if acquire_lock(path):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            release_lock(path)
+        return value
+    deadline = time.monotonic() + settings.BLOG_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        value = cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+    return compute()
@@ -0,0 +1,74 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+
+from blog.cache import get_or_compute
+from blog.models import Category, Location
+
+# Семейство кэша, которое сбрасывается сигналами при изменении модели.
+CHOICE_FAMILIES = {
+    Category: 'categories',
+    Location: 'locations',
+}
+
+
+class CachedChoiceIterator(ModelChoiceIterator):
+    """Варианты выбора из кэша вместо запроса к queryset."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in self.field.get_objects().values():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return (
+            len(self.field.get_objects())
+            + (self.field.empty_label is not None)
+        )
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(
+            self.field.get_objects()
+        )
+
+
+class PublishedChoiceField(forms.ModelChoiceField):
+    """Выбор среди опубликованных категорий или местоположений.
+
+    Объекты хранятся в кэше семейства модели, поэтому отрисовка
+    и проверка формы обходятся без запросов к БД.
+    """
+
+    iterator = CachedChoiceIterator
+
+    def __init__(self, queryset, **kwargs):
+        super().__init__(queryset.filter(is_published=True), **kwargs)
+        self.family = CHOICE_FAMILIES[queryset.model]
+
+    def get_objects(self):
+        """Словарь pk -> объект для всех вариантов выбора."""
+        return get_or_compute(
+            self.family,
+            ('choices',),
+            lambda: {obj.pk: obj for obj in self.queryset},
+        )
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        try:
+            obj = self.get_objects().get(
+                self.queryset.model._meta.pk.to_python(value)
+            )
+        except ValidationError:
+            obj = None
+        if obj is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
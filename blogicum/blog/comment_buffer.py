@@ -0,0 +1,85 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from blog.models import Comment, Post
+
+logger = logging.getLogger('blog.comments')
+
+
+class CommentBuffer:
+    """Копит новые комментарии и записывает их пачками через bulk_create.
+
+    Пачка записывается, когда набирается COMMENT_BATCH_SIZE
+    комментариев или проходит COMMENT_FLUSH_INTERVAL секунд с момента
+    появления первого.
+    """
+
+    def __init__(self):
+        self._comments = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, comment):
+        with self._lock:
+            self._comments.append(comment)
+            full = len(self._comments) >= settings.COMMENT_BATCH_SIZE
+            if not full:
+                self._start_timer()
+        if full:
+            self.flush()
+
+    def _start_timer(self):
+        if self._timer is None:
+            self._timer = threading.Timer(
+                settings.COMMENT_FLUSH_INTERVAL, self.flush_in_thread
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush_in_thread(self):
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+    def flush(self):
+        with self._lock:
+            comments, self._comments = self._comments, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not comments:
+            return []
+        try:
+            return self.write(comments)
+        except Exception:
+            # Пачка возвращается в буфер и будет записана следующим
+            # сбросом, а не теряется вместе с ошибкой.
+            logger.exception(
+                'Не удалось записать комментарии: %s', len(comments)
+            )
+            with self._lock:
+                self._comments[:0] = comments
+                self._start_timer()
+            return []
+
+    @staticmethod
+    def write(comments):
+        # Пост могли удалить, пока комментарий ждал в буфере.
+        existing_posts = set(
+            Post.objects
+            .filter(pk__in={comment.post_id for comment in comments})
+            .values_list('id', flat=True)
+        )
+        return Comment.objects.bulk_create(
+            comment for comment in comments
+            if comment.post_id in existing_posts
+        )
+
+
+comment_buffer = CommentBuffer()
+atexit.register(comment_buffer.flush)
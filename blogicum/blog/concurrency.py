@@ -0,0 +1,61 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+
+def run_query(func, *args, **kwargs):
+    """Выполняет запрос и отпускает соединение потока.
+
+    close_old_connections закрывает соединение по правилам CONN_MAX_AGE,
+    а при включённом пуле (POOL_SIZE) возвращает его в пул.
+    """
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def db_call(func, *args, **kwargs):
+    """Асинхронный запуск запроса в отдельном потоке со своим соединением."""
+    return sync_to_async(run_query, thread_sensitive=False)(
+        func, *args, **kwargs
+    )
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.QUERY_FAN_OUT_WORKERS,
+        thread_name_prefix='blog-query',
+    )
+
+
+def in_transaction():
+    return any(
+        connection.in_atomic_block for connection in connections.all()
+    )
+
+
+def fan_out(*calls):
+    """Выполняет независимые запросы параллельно и возвращает их результаты.
+
+    Если QUERY_FAN_OUT выключен или текущий поток внутри транзакции
+    (другие соединения не увидят её изменений), запросы выполняются
+    последовательно в текущем потоке. Исключение любого запроса
+    пробрасывается вызывающему.
+    """
+    if not settings.QUERY_FAN_OUT or in_transaction():
+        return [call() for call in calls]
+    # Каждый вызов получает копию contextvars потока запроса, иначе
+    # роутер не увидит закрепление за основной БД (primary_pinned).
+    futures = [
+        get_executor().submit(
+            contextvars.copy_context().run, run_query, call
+        )
+        for call in calls
+    ]
+    return [future.result() for future in futures]
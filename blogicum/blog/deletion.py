@@ -0,0 +1,127 @@
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from blog.bulk import delete_posts, iter_pk_chunks, raw_delete
+from blog.concurrency import run_query
+from blog.models import Comment, DeletionJob, Post, User
+
+logger = logging.getLogger('blog.bulk')
+
+
+@lru_cache(maxsize=None)
+def get_deletion_executor():
+    # Один поток: задачи удаления не конкурируют между собой за БД.
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='blog-delete')
+
+
+def delete_comments(queryset):
+    for chunk in iter_pk_chunks(queryset, settings.DELETION_CHUNK_SIZE):
+        yield raw_delete(Comment.objects.filter(pk__in=chunk))
+
+
+def delete_post_steps(post_id):
+    yield from delete_comments(Comment.objects.filter(post_id=post_id))
+    yield delete_posts([post_id])
+
+
+def delete_user_steps(user_id):
+    yield from delete_comments(Comment.objects.filter(author_id=user_id))
+    yield from delete_comments(
+        Comment.objects.filter(post__author_id=user_id)
+    )
+    for chunk in iter_pk_chunks(
+        Post.objects.filter(author_id=user_id), settings.DELETION_CHUNK_SIZE
+    ):
+        yield delete_posts(chunk)
+    # Постов и комментариев уже нет, каскад остаётся небольшим.
+    deleted, _ = User.objects.filter(pk=user_id).delete()
+    yield deleted
+
+
+STEPS = {
+    DeletionJob.USER: delete_user_steps,
+    DeletionJob.POST: delete_post_steps,
+}
+
+
+def create_job(obj):
+    """Скрывает объект и создаёт задачу его удаления."""
+    if isinstance(obj, User):
+        kind = DeletionJob.USER
+        User.objects.filter(pk=obj.pk).update(is_active=False)
+    else:
+        kind = DeletionJob.POST
+        Post.objects.filter(pk=obj.pk).update(is_published=False)
+    return DeletionJob.objects.create(kind=kind, object_id=obj.pk)
+
+
+def claimable_jobs():
+    """Задачи, которые можно взять в работу.
+
+    Ожидающие, упавшие и выполняющиеся, но без прогресса дольше
+    DELETION_STALE_SECONDS: процесс, который их выполнял, завершился.
+    Выполняющаяся задача обновляет updated_at после каждого пакета.
+    """
+    stale = timezone.now() - timedelta(
+        seconds=settings.DELETION_STALE_SECONDS
+    )
+    return DeletionJob.objects.filter(
+        Q(status__in=(DeletionJob.PENDING, DeletionJob.FAILED))
+        | Q(status=DeletionJob.RUNNING, updated_at__lt=stale)
+    )
+
+
+def run_job(job_id, progress=None):
+    """Удаляет объект задачи и его дочерние строки пакетами.
+
+    Каждый пакет фиксируется отдельно, поэтому после сбоя повторный
+    запуск продолжает с оставшихся строк.
+    """
+    # Задача захватывается одним UPDATE: если её уже выполняет другой
+    # процесс, ничего не меняется.
+    claimed = claimable_jobs().filter(pk=job_id).update(
+        status=DeletionJob.RUNNING, error='', updated_at=timezone.now()
+    )
+    job = DeletionJob.objects.get(pk=job_id)
+    if not claimed:
+        return job
+    try:
+        for deleted in STEPS[job.kind](job.object_id):
+            job.deleted_rows += deleted
+            job.save(update_fields=('deleted_rows', 'updated_at'))
+            logger.info('%s: удалено строк %s', job, job.deleted_rows)
+            if progress:
+                progress(job)
+    except Exception:
+        logger.exception('%s: удаление прервано', job)
+        job.status = DeletionJob.FAILED
+        job.error = traceback.format_exc()
+        job.save(update_fields=('status', 'error', 'updated_at'))
+        return job
+    job.status = DeletionJob.DONE
+    job.save(update_fields=('status', 'updated_at'))
+    return job
+
+
+def schedule_deletion(obj):
+    """Ставит удаление объекта в очередь.
+
+    При DELETION_IN_BACKGROUND задача выполняется в отдельном потоке
+    после фиксации текущей транзакции, иначе сразу. Незавершённые
+    задачи продолжает команда process_deletions.
+    """
+    job = create_job(obj)
+    if not settings.DELETION_IN_BACKGROUND:
+        return run_job(job.pk)
+    transaction.on_commit(
+        lambda: get_deletion_executor().submit(run_query, run_job, job.pk)
+    )
+    return job
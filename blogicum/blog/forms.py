@@ -1,6 +1,9 @@
 from django import forms
+from django.conf import settings
 
+from blog.choices import PublishedChoiceField
 from blog.models import Post, Comment, User
+from blog.widgets import LookupSelect
 
 
 class BlogForm(forms.ModelForm):
@@ -8,9 +11,25 @@ class BlogForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author', 'is_published', 'created_at',)
+        field_classes = {
+            'category': PublishedChoiceField,
+            'location': PublishedChoiceField,
+        }
         widgets = {
-            'pub_date': forms.DateInput(attrs={'type': 'date'})
+            'pub_date': forms.DateInput(attrs={'type': 'date'}),
         }
+        if settings.POST_FORM_LOOKUP:
+            widgets.update({
+                'category': LookupSelect('category'),
+                'location': LookupSelect('location'),
+            })
+
+    def _get_validation_exclusions(self):
+        # Категория и местоположение уже проверены по кэшу
+        # в PublishedChoiceField; повторный запрос в full_clean не нужен.
+        return [
+            *super()._get_validation_exclusions(), 'category', 'location'
+        ]
 
 
 class CommentForm(forms.ModelForm):
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает долю попаданий в кэш блога по семействам ключей.'
+
+    def handle(self, *args, **options):
+        stats.flush()
+        for family, counts in stats.read().items():
+            total = counts['hits'] + counts['misses']
+            hit_rate = counts['hits'] / total * 100 if total else 0
+            self.stdout.write(
+                f'{family:12} hits={counts["hits"]:<8} '
+                f'misses={counts["misses"]:<8} hit_rate={hit_rate:.1f}%'
+            )
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.deletion import claimable_jobs, create_job, run_job
+from blog.models import DeletionJob, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет пользователей и посты пакетами. Без аргументов '
+        'продолжает ожидающие, упавшие и брошенные задачи удаления; '
+        'задачи, которые выполняет другой процесс, не трогает.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', action='append', default=[], metavar='USERNAME',
+            help='Поставить в очередь удаление пользователя.',
+        )
+        parser.add_argument(
+            '--post', action='append', default=[], type=int, metavar='ID',
+            help='Поставить в очередь удаление поста.',
+        )
+
+    def handle(self, *args, **options):
+        for username in options['user']:
+            try:
+                create_job(User.objects.get(username=username))
+            except User.DoesNotExist:
+                raise CommandError(f'Пользователь {username} не найден.')
+        for post_id in options['post']:
+            try:
+                create_job(Post.objects.get(pk=post_id))
+            except Post.DoesNotExist:
+                raise CommandError(f'Пост {post_id} не найден.')
+        for job_id in list(claimable_jobs().values_list('pk', flat=True)):
+            job = run_job(job_id, progress=self.report)
+            if job.status == DeletionJob.FAILED:
+                self.stderr.write(f'{job}: ошибка\n{job.error}')
+            elif job.status == DeletionJob.DONE:
+                self.stdout.write(f'{job}: завершено.')
+            else:
+                self.stdout.write(f'{job}: выполняется другим процессом.')
+
+    def report(self, job):
+        self.stdout.write(f'{job}: удалено строк {job.deleted_rows}')
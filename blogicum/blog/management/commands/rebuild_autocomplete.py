@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.autocomplete import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает индекс автодополнения по постам, категориям '
+        'и пользователям (после bulk_create, update и правок в обход '
+        'сигналов).'
+    )
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write('Индекс автодополнения перестроен.')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс постов SQLite '
+        '(после bulk_create, update и правок в обход сигналов).'
+    )
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write('Индекс поиска перестроен.')
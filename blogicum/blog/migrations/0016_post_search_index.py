@@ -0,0 +1,43 @@
+from django.db import migrations
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+    "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+)
+SQLITE_FILL = (
+    'INSERT INTO blog_post_fts (rowid, title, text) '
+    'SELECT id, title, text FROM blog_post'
+)
+POSTGRES_CREATE = (
+    "CREATE INDEX blog_post_search_gin ON blog_post USING GIN ("
+    "to_tsvector('russian', coalesce(blog_post.title, '') || ' ' || "
+    "coalesce(blog_post.text, '')))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(SQLITE_FILL)
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE blog_post_fts')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX blog_post_search_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_views_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:22
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+WORD_RE = re.compile(r'\w+')
+
+
+def get_terms(label):
+    return sorted(set(WORD_RE.findall(label.lower())))
+
+
+def fill_autocomplete(apps, schema_editor):
+    AutocompleteTerm = apps.get_model('blog', 'AutocompleteTerm')
+    sources = (
+        ('post', apps.get_model('blog', 'Post'), 'title'),
+        ('category', apps.get_model('blog', 'Category'), 'title'),
+        ('user', apps.get_model(settings.AUTH_USER_MODEL), 'username'),
+    )
+    for kind, model, field in sources:
+        AutocompleteTerm.objects.bulk_create(
+            (
+                AutocompleteTerm(
+                    term=term, kind=kind, object_id=object_id, label=label
+                )
+                for object_id, label in model.objects.values_list('id', field)
+                for term in get_terms(label)
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0016_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutocompleteTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=256, verbose_name='Слово')),
+                ('kind', models.CharField(choices=[('post', 'Публикация'), ('category', 'Категория'), ('user', 'Пользователь')], max_length=16, verbose_name='Тип')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Идентификатор объекта')),
+                ('label', models.CharField(max_length=256, verbose_name='Подпись')),
+            ],
+            options={
+                'verbose_name': 'слово автодополнения',
+                'verbose_name_plural': 'Слова автодополнения',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='autocompleteterm',
+            index=models.Index(fields=['term'], name='blog_autoco_term_da13bc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='autocompleteterm',
+            index=models.Index(fields=['kind', 'object_id'], name='blog_autoco_kind_73dd95_idx'),
+        ),
+        migrations.RunPython(fill_autocomplete, migrations.RunPython.noop),
+    ]
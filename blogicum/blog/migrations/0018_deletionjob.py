@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_autocompleteterm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('user', 'Пользователь'), ('post', 'Публикация')], max_length=16, verbose_name='Тип')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Идентификатор объекта')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('running', 'Выполняется'), ('done', 'Завершена'), ('failed', 'Ошибка')], default='pending', max_length=16, verbose_name='Статус')),
+                ('deleted_rows', models.PositiveBigIntegerField(default=0, verbose_name='Удалено строк')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'задача удаления',
+                'verbose_name_plural': 'Задачи удаления',
+                'ordering': ('created_at',),
+            },
+        ),
+    ]
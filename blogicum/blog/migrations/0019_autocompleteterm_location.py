@@ -0,0 +1,47 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:41
+
+import re
+
+from django.db import migrations, models
+
+WORD_RE = re.compile(r'\w+')
+
+
+def get_terms(label):
+    return sorted(set(WORD_RE.findall(label.lower())))
+
+
+def fill_locations(apps, schema_editor):
+    AutocompleteTerm = apps.get_model('blog', 'AutocompleteTerm')
+    Location = apps.get_model('blog', 'Location')
+    AutocompleteTerm.objects.bulk_create(
+        (
+            AutocompleteTerm(
+                term=term, kind='location', object_id=object_id, label=label
+            )
+            for object_id, label in Location.objects.values_list('id', 'name')
+            for term in get_terms(label)
+        ),
+        batch_size=1000,
+    )
+
+
+def remove_locations(apps, schema_editor):
+    AutocompleteTerm = apps.get_model('blog', 'AutocompleteTerm')
+    AutocompleteTerm.objects.filter(kind='location').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_deletionjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='autocompleteterm',
+            name='kind',
+            field=models.CharField(choices=[('post', 'Публикация'), ('category', 'Категория'), ('user', 'Пользователь'), ('location', 'Местоположение')], max_length=16, verbose_name='Тип'),
+        ),
+        migrations.RunPython(fill_locations, remove_locations),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0019_autocompleteterm_location'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='autocompleteterm',
+            name='blog_autoco_term_da13bc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='autocompleteterm',
+            index=models.Index(fields=['term'], name='blog_autocompleteterm_term', opclasses=('varchar_pattern_ops',)),
+        ),
+    ]
@@ -107,6 +107,11 @@ class Post(BaseBlogModel):
         related_name='posts',
         verbose_name='Категория',
     )
+    views_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотры',
+    )
     objects = models.Manager()
     published = PublishedPostsManager()
 
@@ -149,3 +154,114 @@ class Comment(BaseBlogModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at', )
+
+
+class AutocompleteTerm(models.Model):
+    """Слово из заголовка поста, названия категории, местоположения
+    или имени пользователя для поиска по префиксу.
+    """
+
+    POST = 'post'
+    CATEGORY = 'category'
+    USER = 'user'
+    LOCATION = 'location'
+    KINDS = (
+        (POST, 'Публикация'),
+        (CATEGORY, 'Категория'),
+        (USER, 'Пользователь'),
+        (LOCATION, 'Местоположение'),
+    )
+
+    term = models.CharField(
+        max_length=settings.MAXLENGTH,
+        verbose_name='Слово',
+    )
+    kind = models.CharField(
+        max_length=16,
+        choices=KINDS,
+        verbose_name='Тип',
+    )
+    object_id = models.PositiveBigIntegerField(
+        verbose_name='Идентификатор объекта',
+    )
+    label = models.CharField(
+        max_length=settings.MAXLENGTH,
+        verbose_name='Подпись',
+    )
+
+    def __str__(self):
+        return self.term
+
+    class Meta:
+        verbose_name = 'слово автодополнения'
+        verbose_name_plural = 'Слова автодополнения'
+        indexes = (
+            # varchar_pattern_ops нужен PostgreSQL для LIKE 'префикс%'
+            # при любой сортировке; другие БД создают обычный индекс.
+            models.Index(
+                fields=('term',),
+                name='blog_autocompleteterm_term',
+                opclasses=('varchar_pattern_ops',),
+            ),
+            models.Index(fields=('kind', 'object_id')),
+        )
+
+
+class DeletionJob(models.Model):
+    """Задача фонового удаления пользователя или поста пакетами."""
+
+    USER = 'user'
+    POST = 'post'
+    KINDS = (
+        (USER, 'Пользователь'),
+        (POST, 'Публикация'),
+    )
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    kind = models.CharField(
+        max_length=16,
+        choices=KINDS,
+        verbose_name='Тип',
+    )
+    object_id = models.PositiveBigIntegerField(
+        verbose_name='Идентификатор объекта',
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Статус',
+    )
+    deleted_rows = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Удалено строк',
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Ошибка',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Обновлено',
+    )
+
+    def __str__(self):
+        return f'{self.get_kind_display()} {self.object_id}'
+
+    class Meta:
+        verbose_name = 'задача удаления'
+        verbose_name_plural = 'Задачи удаления'
+        ordering = ('created_at',)
@@ -0,0 +1,110 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SQLITE_TABLE = 'blog_post_fts'
+
+POSTGRES_VECTOR = (
+    "to_tsvector('russian', coalesce(blog_post.title, '') || ' ' || "
+    "coalesce(blog_post.text, ''))"
+)
+
+WORD_RE = re.compile(r'\w+')
+
+
+def get_words(query):
+    return WORD_RE.findall(query.lower())
+
+
+def to_fts5_query(query):
+    """Слова запроса как префиксы, объединённые через AND.
+
+    Пользовательский ввод не передаётся в синтаксис FTS5 как есть,
+    поэтому кавычки и операторы в запросе не ломают поиск.
+    """
+    return ' '.join(f'"{word}"*' for word in get_words(query))
+
+
+def search_posts(queryset, query):
+    """Фильтрует queryset постов по полнотекстовому запросу с ранжированием.
+
+    SQLite использует таблицу FTS5, PostgreSQL — GIN-индекс по
+    tsvector; для прочих БД остаётся поиск через icontains.
+    """
+    if not get_words(query):
+        return queryset.none()
+    if connection.vendor == 'sqlite':
+        return queryset.extra(
+            tables=[SQLITE_TABLE],
+            where=[
+                f'{SQLITE_TABLE}.rowid = blog_post.id',
+                f'{SQLITE_TABLE} MATCH %s',
+            ],
+            params=[to_fts5_query(query)],
+            select={'rank': f'{SQLITE_TABLE}.rank'},
+            order_by=['rank', '-pub_date'],
+        )
+    if connection.vendor == 'postgresql':
+        return queryset.annotate(
+            matches=RawSQL(
+                f"{POSTGRES_VECTOR} @@ plainto_tsquery('russian', %s)",
+                [query],
+                output_field=BooleanField(),
+            ),
+            rank=RawSQL(
+                f"ts_rank({POSTGRES_VECTOR}, "
+                f"plainto_tsquery('russian', %s))",
+                [query],
+                output_field=FloatField(),
+            ),
+        ).filter(matches=True).order_by('-rank', '-pub_date')
+    for word in get_words(query):
+        queryset = queryset.filter(
+            Q(title__icontains=word) | Q(text__icontains=word)
+        )
+    return queryset
+
+
+def index_post(post):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT OR REPLACE INTO {SQLITE_TABLE} (rowid, title, text) '
+            f'VALUES (%s, %s, %s)',
+            [post.pk, post.title, post.text],
+        )
+
+
+def unindex_post(post_id):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [post_id]
+        )
+
+
+def unindex_posts(post_ids):
+    if connection.vendor != 'sqlite' or not post_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SQLITE_TABLE} WHERE rowid IN '
+            f'({", ".join(["%s"] * len(post_ids))})',
+            list(post_ids),
+        )
+
+
+def rebuild_index():
+    """Заполняет индекс SQLite заново по всем постам."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SQLITE_TABLE} (rowid, title, text) '
+            f'SELECT id, title, text FROM blog_post'
+        )
@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.autocomplete import get_kind, index_object, unindex_object
+from blog.cache import invalidate
+from blog.models import Category, Location, Post, User
+from blog.search import index_post, unindex_post
+
+# Семейства кэша, которые читает код (blog.choices), и модели,
+# при изменении которых они устаревают.
+INVALIDATED_FAMILIES = {
+    Category: ('categories',),
+    Location: ('locations',),
+}
+
+
+def invalidate_blog_cache(sender, **kwargs):
+    invalidate(*INVALIDATED_FAMILIES[sender])
+
+
+for model in INVALIDATED_FAMILIES:
+    post_save.connect(invalidate_blog_cache, sender=model)
+    post_delete.connect(invalidate_blog_cache, sender=model)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, **kwargs):
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Location)
+def update_autocomplete(sender, instance, update_fields=None, **kwargs):
+    # При входе пользователя сохраняется только last_login.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    index_object(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Location)
+def remove_from_autocomplete(sender, instance, **kwargs):
+    unindex_object(get_kind(instance), instance.pk)
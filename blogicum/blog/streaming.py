@@ -0,0 +1,62 @@
+import contextvars
+
+from django.http import StreamingHttpResponse
+from django.template.context import make_context
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+STREAM_MARKER = mark_safe('<!-- stream -->')
+
+
+def render_stream(request, template_name, context, items,
+                  item_name, item_template):
+    """Потоковый аналог render().
+
+    Страница рендерится без списка (на его месте шаблон выводит
+    stream_marker). Всё, что до маркера, отдаётся сразу, затем
+    по одному элементу из items рендерится item_template.
+    """
+    frame = render_to_string(
+        template_name,
+        {**context, 'stream_marker': STREAM_MARKER},
+        request,
+    )
+    head, tail = frame.split(STREAM_MARKER, 1)
+    return StreamingHttpResponse(
+        run_in_context(
+            contextvars.copy_context(),
+            stream_items(
+                request, head, tail, context, items, item_name, item_template
+            ),
+        ),
+        content_type='text/html; charset=utf-8',
+    )
+
+
+def run_in_context(context_vars, chunks):
+    """Итерирует chunks внутри копии контекста запроса.
+
+    Ответ отдаётся уже после middleware, которые к этому времени
+    сбрасывают свои contextvars (например, primary_pinned).
+    """
+    try:
+        while True:
+            try:
+                yield context_vars.run(next, chunks)
+            except StopIteration:
+                return
+    finally:
+        context_vars.run(chunks.close)
+
+
+def stream_items(request, head, tail, context, items,
+                 item_name, item_template):
+    yield head
+    template = get_template(item_template).template
+    # Контекст-процессоры выполняются один раз на весь список.
+    item_context = make_context(context, request)
+    with item_context.bind_template(template):
+        for item in items:
+            with item_context.push({item_name: item}):
+                yield template.render(item_context)
+    yield tail
@@ -1,11 +1,18 @@
+from django.conf import settings
 from django.urls import path
 
-from blog import views
+from blog import async_views, views
+
+# Под ASGI страницы чтения можно отдавать нативными async-view.
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 app_name = 'blog'
 
 urlpatterns = [
-    path('', views.index, name='index'),
+    path('', read_views.index, name='index'),
+    path('search/', views.search, name='search'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
+    path('lookup/<str:field_name>/', views.lookup, name='lookup'),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -13,7 +20,7 @@ urlpatterns = [
     ),
     path(
         'posts/<int:pk>/',
-        views.post_detail,
+        read_views.post_detail,
         name='post_detail',
     ),
     path(
@@ -28,7 +35,7 @@ urlpatterns = [
     ),
     path(
         'category/<slug:category_slug>/',
-        views.category_posts,
+        read_views.category_posts,
         name='category_posts',
     ),
     path(
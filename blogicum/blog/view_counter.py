@@ -0,0 +1,66 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+from blog.models import Post
+
+logger = logging.getLogger('blog.views_count')
+
+
+class ViewCounter:
+    """Счётчик просмотров постов с отложенной записью в БД.
+
+    Просмотры копятся в памяти процесса и раз в VIEW_COUNTS_FLUSH_INTERVAL
+    секунд записываются одним UPDATE ... CASE на пачку постов.
+    Остаток записывается при остановке процесса.
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, post_id):
+        """Учитывает просмотр; True — пора вызвать flush()."""
+        with self._lock:
+            self._counts[post_id] += 1
+            return (
+                time.monotonic() - self._flushed_at
+                >= settings.VIEW_COUNTS_FLUSH_INTERVAL
+            )
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        try:
+            self.write(counts)
+        except Exception:
+            logger.exception('Не удалось записать просмотры: %s', len(counts))
+            with self._lock:
+                self._counts.update(counts)
+            return Counter()
+        return counts
+
+    @staticmethod
+    def write(counts):
+        items = list(counts.items())
+        for start in range(0, len(items), settings.VIEW_COUNTS_BATCH_SIZE):
+            batch = dict(items[start:start + settings.VIEW_COUNTS_BATCH_SIZE])
+            Post.objects.filter(pk__in=batch).update(
+                views_count=F('views_count') + Case(
+                    *(When(pk=pk, then=Value(count))
+                      for pk, count in batch.items()),
+                    default=Value(0),
+                    output_field=PositiveIntegerField(),
+                )
+            )
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
@@ -1,7 +1,9 @@
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models import Count
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.utils import timezone
 from django.views.generic import (
@@ -10,25 +12,50 @@ from django.views.generic import (
 from django.urls import reverse
 from django.core.paginator import Paginator
 
-from blog.models import Post, Category, Comment, User
+from blog.autocomplete import filter_by_prefix, suggest
+from blog.comment_buffer import comment_buffer
+from blog.concurrency import fan_out
+from blog.models import AutocompleteTerm, Post, Category, Comment, User
 from blog.forms import BlogForm, CommentForm, ProfileForm
+from blog.search import search_posts
+from blog.streaming import render_stream
+from blog.view_counter import view_counter
+
+# Поле формы поста -> тип слов индекса автодополнения и поле сортировки.
+LOOKUP_FIELDS = {
+    'category': (AutocompleteTerm.CATEGORY, 'title'),
+    'location': (AutocompleteTerm.LOCATION, 'name'),
+}
+
+
+class CachedObjectMixin:
+    """Миксин: объект загружается из БД один раз за запрос."""
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
 
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+class OnlyAuthorMixin(CachedObjectMixin, UserPassesTestMixin):
     """Миксин для проверки авторизации."""
 
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
 
-class PostsReverseMixin:
+class PostsReverseMixin(CachedObjectMixin):
     """Миксин для постов."""
 
     model = Post
     form_class = BlogForm
     template_name = 'blog/create.html'
 
+    def get_queryset(self):
+        return Post.objects.select_related('location', 'category', 'author')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['is_edit_post'] = '/edit/' in self.request.path
@@ -40,7 +67,7 @@ class PostsReverseMixin:
         return super().form_valid(form)
 
 
-class CommentPostMixin:
+class CommentPostMixin(CachedObjectMixin):
     """Миксин для комментариев."""
 
     model = Comment
@@ -49,7 +76,13 @@ class CommentPostMixin:
     pk_url_kwarg = 'comment_id'
 
     def get_queryset(self):
-        return self.request.user.comments.filter(author=self.request.user)
+        # Вместе с pk комментария проверяются автор и post_id из URL:
+        # чужой комментарий или комментарий другого поста дадут 404
+        # без дополнительных запросов.
+        return Comment.objects.filter(
+            author_id=self.request.user.pk,
+            post_id=self.kwargs['post_id'],
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -57,8 +90,9 @@ class CommentPostMixin:
         return context
 
     def get_success_url(self):
-        post_id = self.object.post.pk
-        return reverse('blog:post_detail', kwargs={'pk': post_id})
+        return reverse(
+            'blog:post_detail', kwargs={'pk': self.object.post_id}
+        )
 
 
 class PostCreateView(LoginRequiredMixin, PostsReverseMixin, CreateView):
@@ -73,7 +107,7 @@ class PostUpdateView(LoginRequiredMixin, PostsReverseMixin, UpdateView):
     def dispatch(self, request, *args, **kwargs):
         instance = self.get_object()
         post_id = self.kwargs.get('pk')
-        if instance.author != request.user:
+        if instance.author_id != request.user.pk:
             return redirect(
                 'blog:post_detail',
                 pk=post_id,
@@ -92,7 +126,7 @@ class PostDeleteView(OnlyAuthorMixin, PostsReverseMixin, DeleteView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['form'] = BlogForm(instance=self.get_object())
+        context['form'] = BlogForm(instance=self.object)
         return context
 
 
@@ -143,10 +177,16 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     template_name = 'blog/create.html'
 
     def form_valid(self, form):
-        form.instance.post = get_object_or_404(Post, pk=self.kwargs['pk'])
+        post_id = self.kwargs['pk']
+        if not Post.objects.filter(pk=post_id).exists():
+            raise Http404
+        form.instance.post_id = post_id
         form.instance.author = self.request.user
-        form.save()
-        return redirect('blog:post_detail', pk=self.kwargs['pk'])
+        if settings.COMMENT_BATCHING:
+            comment_buffer.add(form.instance)
+        else:
+            form.save()
+        return redirect('blog:post_detail', pk=post_id)
 
 
 class CommentUpdateView(LoginRequiredMixin, CommentPostMixin, UpdateView):
@@ -179,36 +219,51 @@ def index(request):
     context = {
         'page_obj': page_obj
     }
+    if settings.STREAM_PAGES:
+        return render_stream(
+            request, 'blog/index.html', context,
+            page_obj.object_list.iterator(
+                chunk_size=settings.STREAM_CHUNK_SIZE
+            ),
+            'post', 'includes/post_article.html',
+        )
     return render(request, 'blog/index.html', context)
 
 
 def post_detail(request, pk):
     """Функция возвращает пост."""
-    post = (
-        get_object_or_404(
-            (Post.objects
-             .select_related(
-                 'location',
-                 'category',
-                 'author',)
-             ), pk=pk
-        )
+    load_post = partial(
+        get_object_or_404,
+        Post.objects.select_related('location', 'category', 'author'),
+        pk=pk,
     )
-    if request.user != post.author and (
+    load_user = partial(getattr, request.user, 'is_authenticated')
+    comments = Comment.objects.filter(post_id=pk).select_related('author')
+    if settings.STREAM_PAGES:
+        post, _ = fan_out(load_post, load_user)
+    else:
+        post, _, comments = fan_out(
+            load_post, load_user, partial(list, comments)
+        )
+    if post.author_id != request.user.pk and (
         post.is_published is False
         or post.category.is_published is False
         or post.pub_date > timezone.now()
     ):
         raise Http404
-    else:
-        form = CommentForm()
-        comments = post.comments.all()
-        context = {
-            'post': post,
-            'form': form,
-            'comments': comments
-        }
-
+    if settings.VIEW_COUNTS and view_counter.add(post.pk):
+        view_counter.flush()
+    context = {
+        'post': post,
+        'form': CommentForm(),
+        'comments': comments
+    }
+    if settings.STREAM_PAGES:
+        return render_stream(
+            request, 'blog/detail.html', context,
+            comments.iterator(chunk_size=settings.STREAM_CHUNK_SIZE),
+            'comment', 'includes/comment.html',
+        )
     return render(request, 'blog/detail.html', context)
 
 
@@ -232,4 +287,61 @@ def category_posts(request, category_slug):
         'category': category,
         'page_obj': page_obj
     }
+    if settings.STREAM_PAGES:
+        return render_stream(
+            request, 'blog/category.html', context,
+            page_obj.object_list.iterator(
+                chunk_size=settings.STREAM_CHUNK_SIZE
+            ),
+            'post', 'includes/post_article.html',
+        )
     return render(request, 'blog/category.html', context)
+
+
+def search(request):
+    """Функция возвращает результаты полнотекстового поиска."""
+    query = request.GET.get('q', '').strip()
+    posts = search_posts(
+        Post.published
+        .select_related(
+            'location',
+            'category',
+            'author'
+        )
+        .annotate(comment_count=Count('comments')),
+        query,
+    )
+    paginator = Paginator(posts, settings.PAGINATED_BY)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    context = {
+        'query': query,
+        'page_obj': page_obj
+    }
+    return render(request, 'blog/search.html', context)
+
+
+def autocomplete(request):
+    """Подсказки по заголовкам постов, категориям и пользователям."""
+    return JsonResponse({
+        'results': suggest(
+            request.GET.get('q', ''), settings.AUTOCOMPLETE_LIMIT
+        )
+    })
+
+
+def lookup(request, field_name):
+    """Варианты для полей category и location формы поста."""
+    if field_name not in LOOKUP_FIELDS:
+        raise Http404
+    field = BlogForm.base_fields[field_name]
+    kind, ordering = LOOKUP_FIELDS[field_name]
+    objects = filter_by_prefix(
+        field.queryset, kind, request.GET.get('q', '')
+    ).order_by(ordering)[:settings.AUTOCOMPLETE_LIMIT]
+    return JsonResponse({
+        'results': [
+            {'id': obj.pk, 'text': field.label_from_instance(obj)}
+            for obj in objects
+        ]
+    })
@@ -0,0 +1,54 @@
+from django import forms
+from django.urls import reverse_lazy
+
+
+class LookupSelect(forms.Select):
+    """Select, в котором отрисован только выбранный вариант.
+
+    Остальные варианты подгружаются по мере ввода из JSON-эндпоинта
+    blog:lookup, поэтому размер страницы не зависит от размера таблицы.
+    """
+
+    def __init__(self, field_name, attrs=None):
+        super().__init__(attrs)
+        self.field_name = field_name
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-lookup-url'] = reverse_lazy(
+            'blog:lookup', kwargs={'field_name': self.field_name}
+        )
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = {
+            str(item) for item in value
+            if str(item) not in self.choices.field.empty_values
+        }
+        choices = [('', self.choices.field.empty_label or '')]
+        if selected:
+            choices += [
+                (obj.pk, self.choices.field.label_from_instance(obj))
+                for obj in self.get_selected_objects(selected)
+            ]
+        groups = []
+        for index, (option_value, label) in enumerate(choices):
+            option_value = '' if option_value is None else str(option_value)
+            groups.append((None, [self.create_option(
+                name, option_value, label, option_value in selected, index,
+                attrs=attrs,
+            )], index))
+        return groups
+
+    def get_selected_objects(self, selected):
+        """Выбранные объекты; у PublishedChoiceField — из его кэша."""
+        field = self.choices.field
+        if hasattr(field, 'get_objects'):
+            return [
+                obj for pk, obj in field.get_objects().items()
+                if str(pk) in selected
+            ]
+        return self.choices.queryset.filter(pk__in=selected)
+
+    class Media:
+        js = ('blog/js/lookup_select.js',)
@@ -0,0 +1,130 @@
+import threading
+
+
+class ConnectionPool:
+    """Небольшой пул открытых DB-API соединений одного алиаса БД."""
+
+    def __init__(self, size):
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return None
+
+    def put(self, connection):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(connection)
+                return True
+        return False
+
+    def drain(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+# Параметры из DATABASES, которые определяют, куда ведёт соединение.
+POOL_KEY_SETTINGS = ('ENGINE', 'NAME', 'USER', 'HOST', 'PORT')
+
+
+def get_pool(key, size):
+    """Пул соединений с параметрами key = (алиас, *параметры).
+
+    Если параметры алиаса изменились (например, NAME тестовой БД),
+    пул со старыми параметрами закрывается.
+    """
+    with pools_lock:
+        pool = pools.get(key)
+        if pool is None:
+            for old_key in [k for k in pools if k[0] == key[0]]:
+                pools.pop(old_key).drain()
+            pool = pools[key] = ConnectionPool(size)
+        return pool
+
+
+def is_raw_connection_usable(connection):
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        finally:
+            cursor.close()
+    except Exception:
+        return False
+    return True
+
+
+class PooledConnectionMixin:
+    """Переиспользование соединений между потоками и запросами.
+
+    Настройки берутся из записи в DATABASES:
+    POOL_SIZE — сколько закрытых соединений держать открытыми
+    (0 — пул выключен); CONN_HEALTH_CHECKS — проверять соединение
+    запросом SELECT 1 перед повторным использованием.
+    """
+
+    @property
+    def pool(self):
+        size = self.settings_dict.get('POOL_SIZE', 0)
+        if not size:
+            return None
+        key = (self.alias, *(
+            str(self.settings_dict.get(name)) for name in POOL_KEY_SETTINGS
+        ))
+        return get_pool(key, size)
+
+    @property
+    def health_checks(self):
+        return self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is not None:
+            connection = pool.get()
+            while connection is not None:
+                if (
+                    not self.health_checks
+                    or is_raw_connection_usable(connection)
+                ):
+                    return connection
+                connection.close()
+                connection = pool.get()
+        connection = super().get_new_connection(conn_params)
+        self.configure_new_connection(connection)
+        return connection
+
+    def configure_new_connection(self, connection):
+        """Донастройка только что открытого соединения."""
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        if (
+            self.connection is not None
+            and self.health_checks
+            and not self.is_usable()
+        ):
+            self.close()
+
+    def _close(self):
+        pool = self.pool
+        if (
+            pool is None
+            or self.connection is None
+            or self.errors_occurred
+            or self.in_atomic_block
+        ):
+            return super()._close()
+        with self.wrap_database_errors:
+            self.connection.rollback()
+        if not pool.put(self.connection):
+            return super()._close()
+        return None
@@ -0,0 +1,7 @@
+from django.db.backends.postgresql import base
+
+from blogicum.db.pool import PooledConnectionMixin
+
+
+class DatabaseWrapper(PooledConnectionMixin, base.DatabaseWrapper):
+    """PostgreSQL с пулом соединений и проверкой их работоспособности."""
@@ -0,0 +1,25 @@
+from django.db.backends.sqlite3 import base
+
+from blogicum.db.pool import PooledConnectionMixin
+
+
+def apply_pragmas(connection, pragmas):
+    """Выполняет PRAGMA-настройки на новом соединении SQLite."""
+    cursor = connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+
+class DatabaseWrapper(PooledConnectionMixin, base.DatabaseWrapper):
+    """SQLite с настройками из ключа PRAGMAS в DATABASES.
+
+    WAL позволяет читателям не блокироваться на записи комментариев,
+    а busy_timeout заставляет писателей ждать вместо ошибки
+    "database is locked".
+    """
+
+    def configure_new_connection(self, connection):
+        apply_pragmas(connection, self.settings_dict.get('PRAGMAS', {}))
@@ -0,0 +1,490 @@
+import asyncio
+import contextvars
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import FileResponse
+from django.template.base import Template
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from blogicum.routers import primary_pinned
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PRESERVED_RE = re.compile(
+    r'<(pre|textarea|script|style)\b.*?</\1\s*>'
+    r'|<[^<>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^<>"\']*)*>',
+    re.IGNORECASE | re.DOTALL,
+)
+QUOTED_RE = re.compile(r'"[^"]*"|\'[^\']*\'|[^"\']+')
+WHITESPACE_RE = re.compile(r'\s{2,}')
+GZIP_RE = re.compile(r'\bgzip\b')
+BROTLI_RE = re.compile(r'\bbr\b')
+
+logger = logging.getLogger('blogicum.instrumentation')
+
+request_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+def collapse_whitespace(chunk):
+    """Схлопывает повторяющиеся пробельные символы в один."""
+    return WHITESPACE_RE.sub(
+        lambda match: '\n' if '\n' in match.group(0) else ' ',
+        chunk,
+    )
+
+
+def minify_tag(tag):
+    """Схлопывает пробелы между атрибутами, не трогая значения в кавычках."""
+    return ''.join(
+        part if part[0] in '"\'' else collapse_whitespace(part)
+        for part in QUOTED_RE.findall(tag)
+    )
+
+
+def minify_html(html):
+    """Минифицирует HTML, не трогая содержимое pre/textarea/script/style
+    и значения атрибутов в кавычках.
+    """
+    result = []
+    position = 0
+    for match in PRESERVED_RE.finditer(html):
+        result.append(collapse_whitespace(html[position:match.start()]))
+        if match.group(1):
+            result.append(match.group(0))
+        else:
+            result.append(minify_tag(match.group(0)))
+        position = match.end()
+    result.append(collapse_whitespace(html[position:]))
+    return ''.join(result)
+
+
+class HtmlMinifyMiddleware(MiddlewareMixin):
+    """Убирает лишние пробелы из HTML-ответов."""
+
+    def process_response(self, request, response):
+        if (
+            not settings.HTML_MINIFY
+            or response.streaming
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith('text/html')
+        ):
+            return response
+        charset = response.charset
+        content = minify_html(response.content.decode(charset))
+        response.content = content.encode(charset)
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
+
+
+class CompressedContentCache:
+    """Потокобезопасный LRU-кэш сжатых тел ответов."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+compressed_content_cache = CompressedContentCache(
+    settings.COMPRESSION_CACHE_SIZE
+)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает ответы brotli (если установлен) или gzip.
+
+    Ответы меньше COMPRESSION_MIN_LENGTH байт отдаются как есть.
+    Сжатые тела общих (не персональных) ответов кэшируются по хэшу
+    содержимого, чтобы не сжимать одну и ту же страницу повторно.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or len(response.content) < settings.COMPRESSION_MIN_LENGTH
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.get_encoding(request)
+        if encoding is None:
+            return response
+        content = self.compress(response, encoding)
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+        return response
+
+    @staticmethod
+    def get_encoding(request):
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and BROTLI_RE.search(accept_encoding):
+            return 'br'
+        if GZIP_RE.search(accept_encoding):
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def is_cacheable(response):
+        cache_control = response.get('Cache-Control', '').lower()
+        vary = response.get('Vary', '').lower()
+        return (
+            not response.cookies
+            and 'private' not in cache_control
+            and 'no-store' not in cache_control
+            and 'cookie' not in vary
+        )
+
+    def compress(self, response, encoding):
+        if not self.is_cacheable(response):
+            return self.compress_content(response.content, encoding)
+        key = (encoding, hashlib.sha1(response.content).hexdigest())
+        content = compressed_content_cache.get(key)
+        if content is None:
+            content = self.compress_content(response.content, encoding)
+            compressed_content_cache.set(key, content)
+        return content
+
+    @staticmethod
+    def compress_content(content, encoding):
+        if encoding == 'br':
+            return brotli.compress(content, quality=settings.BROTLI_QUALITY)
+        return gzip.compress(
+            content, compresslevel=settings.GZIP_LEVEL, mtime=0
+        )
+
+
+class StaticFilesMiddleware(MiddlewareMixin):
+    """Отдаёт собранную статику без обращения к сессии и БД.
+
+    Если клиент принимает сжатые ответы, отдаётся предсжатая копия
+    (.br или .gz). Файлы с хэшем в имени кэшируются как immutable.
+    """
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.immutable_names = set(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+        )
+
+    def process_request(self, request):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or not request.path.startswith(settings.STATIC_URL)
+        ):
+            return None
+        return self.serve(request, request.path[len(settings.STATIC_URL):])
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        content_type, _ = mimetypes.guess_type(path)
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = None
+        for suffix, candidate, pattern in (
+            ('.br', 'br', BROTLI_RE),
+            ('.gz', 'gzip', GZIP_RE),
+        ):
+            if (
+                pattern.search(accept_encoding)
+                and os.path.isfile(path + suffix)
+            ):
+                path += suffix
+                encoding = candidate
+                break
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        if encoding is not None:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if name in self.immutable_names:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.STATIC_IMMUTABLE_MAX_AGE,
+                immutable=True,
+            )
+        else:
+            patch_cache_control(
+                response, public=True, max_age=settings.STATIC_MAX_AGE
+            )
+        return response
+
+
+class RequestMetrics:
+    """Счётчики одного запроса: SQL-запросы, время БД и шаблонов."""
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.queries = Counter()
+        # Запросы из потоков fan_out и db_call пишут сюда же.
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self.lock:
+                self.db_time += time.perf_counter() - start
+                self.queries[(sql, repr(params))] += 1
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.queries.values() if count > 1)
+
+
+def instrument_templates():
+    """Оборачивает Template.render, чтобы замерять время рендера.
+
+    Учитывается только внешний шаблон: include и extends внутри него
+    не суммируются повторно.
+    """
+    original_render = Template.render
+    if getattr(original_render, 'instrumented', False):
+        return
+
+    @functools.wraps(original_render)
+    def render(self, context):
+        metrics = request_metrics.get()
+        if metrics is None or metrics.template_depth:
+            return original_render(self, context)
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+            metrics.template_depth -= 1
+
+    render.instrumented = True
+    Template.render = render
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def instrument_connection(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def instrument_queries():
+    """Учитывает запросы всех соединений, а не только потока запроса.
+
+    Потоки fan_out и db_call открывают свои соединения; метрики
+    запроса они находят через contextvars, скопированные из него.
+    """
+    connection_created.connect(instrument_connection)
+    for connection in connections.all():
+        instrument_connection(connection)
+
+
+class InstrumentationMiddleware:
+    """Замеряет время view, БД и шаблонов для доли запросов.
+
+    Доля задаётся INSTRUMENTATION_SAMPLE_RATE. Результат пишется
+    в заголовок Server-Timing и в лог blogicum.instrumentation.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        instrument_templates()
+        instrument_queries()
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+        total_time = time.perf_counter() - start
+        self.report(request, response, metrics, total_time)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+        total_time = time.perf_counter() - start
+        self.report(request, response, metrics, total_time)
+        return response
+
+    @staticmethod
+    def report(request, response, metrics, total_time):
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        if settings.INSTRUMENTATION_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join((
+                f'total;dur={total_time * 1000:.1f}',
+                f'db;dur={metrics.db_time * 1000:.1f};'
+                f'desc="{metrics.query_count} queries"',
+                f'tpl;dur={metrics.template_time * 1000:.1f}',
+            ))
+        level = logging.WARNING if metrics.duplicate_count else logging.INFO
+        logger.log(level, json.dumps({
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_time * 1000, 2),
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'template_ms': round(metrics.template_time * 1000, 2),
+            'queries': metrics.query_count,
+            'duplicate_queries': metrics.duplicate_count,
+        }))
+
+
+class PrimaryPinMiddleware:
+    """Привязывает чтение к основной БД на время записи и после неё.
+
+    После небезопасного запроса (POST и т. п.) клиенту ставится кука
+    на REPLICA_PIN_SECONDS секунд: пока она жива, автор читает
+    свои изменения с основной БД, а не с отстающей реплики.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REPLICA_DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self.pin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            primary_pinned.reset(token)
+        return self.set_pin_cookie(request, response)
+
+    async def __acall__(self, request):
+        token = self.pin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            primary_pinned.reset(token)
+        return self.set_pin_cookie(request, response)
+
+    @staticmethod
+    def is_write(request):
+        return request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def pin(self, request):
+        return primary_pinned.set(
+            self.is_write(request)
+            or settings.REPLICA_PIN_COOKIE in request.COOKIES
+        )
+
+    def set_pin_cookie(self, request, response):
+        if self.is_write(request):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class LazyAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware без обращения к сессии у анонимов.
+
+    Без сессионной куки пользователь заведомо анонимный, поэтому
+    сессия не загружается и таблица сессий не запрашивается.
+    """
+
+    def process_request(self, request):
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return super().process_request(request)
+        request.user = AnonymousUser()
+        return None
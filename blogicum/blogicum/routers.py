@@ -0,0 +1,28 @@
+import contextvars
+import random
+
+from django.conf import settings
+
+primary_pinned = contextvars.ContextVar('primary_pinned', default=False)
+
+
+class PrimaryReplicaRouter:
+    """Запись — в default, чтение — в случайную реплику.
+
+    Пока primary_pinned установлен (запрос на запись или недавняя
+    запись этого клиента), чтение тоже идёт в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not settings.REPLICA_DATABASES or primary_pinned.get():
+            return 'default'
+        return random.choice(settings.REPLICA_DATABASES)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,11 +31,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blogicum.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.middleware.StaticFilesMiddleware',
+    'blogicum.middleware.CompressionMiddleware',
+    'blogicum.middleware.HtmlMinifyMiddleware',
+    'blogicum.middleware.PrimaryPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blogicum.middleware.LazyAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -63,13 +69,103 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 # Database
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE: sqlite3 (по умолчанию) или postgresql.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite3')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'blogicum.db.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'blogicum'),
+            'USER': os.getenv('POSTGRES_USER', 'blogicum'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'blogicum.db.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # Применяются к каждому новому соединению.
+            'PRAGMAS': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'busy_timeout': 5000,
+                'mmap_size': 256 * 1024 * 1024,
+                'cache_size': -20000,
+                'temp_store': 'MEMORY',
+            },
+        }
+    }
+
+DATABASES['default'].update({
+    # Секунды жизни соединения; 0 — закрывать после каждого запроса.
+    'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
+    'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS') == 'True',
+    # Соединения, которые держатся открытыми между потоками (0 — без пула).
+    'POOL_SIZE': int(os.getenv('DB_POOL_SIZE', 0)),
+})
+
+# DB_REPLICAS: реплики для чтения через запятую — пути к файлам SQLite
+# или хосты PostgreSQL.
+for number, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    location = 'NAME' if DB_ENGINE == 'sqlite3' else 'HOST'
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        location: replica.strip(),
+        'TEST': {'MIRROR': 'default'},
     }
+
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['blogicum.routers.PrimaryReplicaRouter']
+
+# Сколько секунд после записи читать с основной БД.
+REPLICA_PIN_SECONDS = 5
+
+REPLICA_PIN_COOKIE = 'primary_pin'
+
+# Cache
+
+BLOG_CACHE_LOCATION = Path(
+    os.getenv('BLOG_CACHE_LOCATION', BASE_DIR / 'cache')
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Общий для всех процессов кэш блога без внешних сервисов.
+    'blog': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BLOG_CACHE_LOCATION,
+        'KEY_PREFIX': 'blog',
+        'TIMEOUT': 300,
+    },
 }
 
+BLOG_CACHE_ALIAS = 'blog'
+
+# Сколько секунд ждать значения, которое пересчитывает другой процесс.
+BLOG_CACHE_LOCK_TIMEOUT = 10
+
+# Файлы блокировок пересчёта: FileBasedCache.add не атомарен между
+# процессами, а создание файла с O_CREAT | O_EXCL — атомарно.
+BLOG_CACHE_LOCK_DIR = BLOG_CACHE_LOCATION / 'locks'
+
+BLOG_CACHE_STATS_FLUSH_INTERVAL = 10
+
+# Sessions
+
+# SESSION_BACKEND: db, cached_db (по умолчанию) или signed_cookies.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.getenv(
+    'SESSION_BACKEND', 'cached_db'
+)
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -103,6 +199,29 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'collected_static'
+
+STATICFILES_STORAGE = 'blogicum.storage.CompressedManifestStaticFilesStorage'
+
+# Bootstrap из static/vendor/bootstrap (manage.py vendor_bootstrap);
+# пока файлы не скачаны, django_bootstrap5 подключает их с CDN.
+BOOTSTRAP_VENDOR_DIR = BASE_DIR / 'static' / 'vendor' / 'bootstrap'
+
+# Путь для static(): ссылку строит тег vendor_bootstrap_css,
+# чтобы она шла через манифест STATICFILES_STORAGE.
+BOOTSTRAP_VENDOR_CSS = (
+    'vendor/bootstrap/css/bootstrap.min.css'
+    if (BOOTSTRAP_VENDOR_DIR / 'css' / 'bootstrap.min.css').exists()
+    else None
+)
+
+# Отдавать статику из STATIC_ROOT силами Django (без nginx).
+STATIC_SERVE = not DEBUG
+
+STATIC_MAX_AGE = 60 * 60
+
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
 # Default primary key field type
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -113,6 +232,50 @@ MAXLENGTH = 256
 
 PAGINATED_BY = 10
 
+# Отдавать ленты и страницу поста потоком (StreamingHttpResponse).
+STREAM_PAGES = False
+
+STREAM_CHUNK_SIZE = 100
+
+# Асинхронные версии index, category_posts и post_detail (для ASGI).
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS') == 'True'
+
+# Независимые запросы страницы поста выполняются параллельно в потоках.
+QUERY_FAN_OUT = os.getenv('QUERY_FAN_OUT') == 'True'
+
+QUERY_FAN_OUT_WORKERS = 8
+
+# Запись комментариев пачками через bulk_create. Новый комментарий
+# появляется на странице с задержкой до COMMENT_FLUSH_INTERVAL секунд.
+COMMENT_BATCHING = os.getenv('COMMENT_BATCHING') == 'True'
+
+COMMENT_BATCH_SIZE = 50
+
+COMMENT_FLUSH_INTERVAL = 1.0
+
+# Просмотры постов копятся в памяти и записываются в БД пачками.
+VIEW_COUNTS = True
+
+VIEW_COUNTS_FLUSH_INTERVAL = 10
+
+VIEW_COUNTS_BATCH_SIZE = 500
+
+AUTOCOMPLETE_LIMIT = 10
+
+# Поля category и location формы поста: поиск через blog:lookup или
+# обычный select с вариантами из кэша.
+POST_FORM_LOOKUP = os.getenv('POST_FORM_LOOKUP', 'True') == 'True'
+
+ADMIN_EXACT_COUNT_LIMIT = 10000
+ADMIN_RELATED_POSTS_PER_PAGE = 20
+ADMIN_BULK_CHUNK_SIZE = 500
+
+DELETION_CHUNK_SIZE = 1000
+DELETION_IN_BACKGROUND = True
+# Задача в статусе running без прогресса дольше этого времени
+# считается брошенной, и process_deletions продолжает её.
+DELETION_STALE_SECONDS = 10 * 60
+
 MEDIA_ROOT = BASE_DIR / 'media'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -122,3 +285,54 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
+
+# Output pipeline
+
+HTML_MINIFY = True
+
+COMPRESSION_MIN_LENGTH = 500
+
+COMPRESSION_CACHE_SIZE = 256
+
+GZIP_LEVEL = 6
+
+BROTLI_QUALITY = 5
+
+# Instrumentation
+
+# Доля запросов, для которых собираются метрики (0 — выключено).
+INSTRUMENTATION_SAMPLE_RATE = 0.1
+
+INSTRUMENTATION_SERVER_TIMING = True
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'blog.bulk': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'blog.comments': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'blog.views_count': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
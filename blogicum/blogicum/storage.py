@@ -0,0 +1,50 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.txt', '.json')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена статики и кладёт рядом сжатые .gz и .br копии."""
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        # До collectstatic файлов в STATIC_ROOT нет: отдаём имя без хэша.
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if kwargs.get('dry_run'):
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.precompress(hashed_name)
+
+    def precompress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        self.save_compressed(
+            f'{name}.gz',
+            gzip.compress(content, compresslevel=9, mtime=0),
+        )
+        if brotli is not None:
+            self.save_compressed(
+                f'{name}.br',
+                brotli.compress(content, quality=11),
+            )
+
+    def save_compressed(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
@@ -0,0 +1,49 @@
+import base64
+import hashlib
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django_bootstrap5.core import BOOTSTRAP5_DEFAULTS
+
+ASSETS = {
+    'css_url': Path('css') / 'bootstrap.min.css',
+    'javascript_url': Path('js') / 'bootstrap.bundle.min.js',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Скачивает Bootstrap той версии, что использует django_bootstrap5, '
+        'в static/vendor/bootstrap и проверяет SRI-хэш. '
+        'Пока файлов нет, страницы подключают Bootstrap с CDN.'
+    )
+
+    def handle(self, *args, **options):
+        target_dir = settings.BOOTSTRAP_VENDOR_DIR
+        for setting_name, relative_path in ASSETS.items():
+            # Источник берётся из умолчаний пакета: так версия файлов
+            # совпадает с той, что django_bootstrap5 подключает с CDN.
+            asset = BOOTSTRAP5_DEFAULTS[setting_name]
+            with urlopen(asset['url']) as response:
+                content = response.read()
+            self.check_integrity(asset, content)
+            path = target_dir / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            self.stdout.write(f'{asset["url"]} -> {path}')
+
+    @staticmethod
+    def check_integrity(asset, content):
+        integrity = asset.get('integrity')
+        if not integrity:
+            return
+        algorithm, expected = integrity.split('-', 1)
+        digest = base64.b64encode(
+            hashlib.new(algorithm, content).digest()
+        ).decode()
+        if digest != expected:
+            raise CommandError(
+                f'Хэш {asset["url"]} не совпадает с {integrity}'
+            )
@@ -0,0 +1,15 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django_bootstrap5.html import render_link_tag
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_bootstrap_css():
+    """Bootstrap CSS из статики проекта, а пока файл не скачан — с CDN."""
+    if settings.BOOTSTRAP_VENDOR_CSS is None:
+        return bootstrap_css()
+    return render_link_tag(static(settings.BOOTSTRAP_VENDOR_CSS))
@@ -1,16 +1,58 @@
-from django.shortcuts import render
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.html import escape
+
+ERROR_PAGE_URL_PLACEHOLDER = '__ERROR_PAGE_URL__'
+
+
+@lru_cache(maxsize=None)
+def get_error_page(template_name):
+    """Заранее отрисованная страница ошибки.
+
+    Шаблон рендерится без контекст-процессоров, поэтому не обращается
+    к сессии и пользователю: шапка выводится без блока входа,
+    адрес запроса подставляется позже.
+    """
+    return render_to_string(
+        template_name,
+        {'request_url': ERROR_PAGE_URL_PLACEHOLDER, 'error_page': True},
+    )
+
+
+@receiver(setting_changed)
+def clear_error_pages(**kwargs):
+    """Сбрасывает закэшированные страницы при изменении настроек."""
+    get_error_page.cache_clear()
+
+
+def error_response(request, template_name, status):
+    """Отдаёт страницу ошибки из кэша, минуя сессию и БД."""
+    if settings.DEBUG:
+        get_error_page.cache_clear()
+    content = get_error_page(template_name)
+    if ERROR_PAGE_URL_PLACEHOLDER in content:
+        content = content.replace(
+            ERROR_PAGE_URL_PLACEHOLDER,
+            escape(request.build_absolute_uri()),
+        )
+    return HttpResponse(content, status=status)
 
 
 def page_not_found(request, exception):
     """Кастомная страница для ошибки 404."""
-    return render(request, 'pages/404.html', status=404)
+    return error_response(request, 'pages/404.html', status=404)
 
 
 def server_error(request):
     """Кастомная страница для ошибки 500."""
-    return render(request, 'pages/500.html', status=500)
+    return error_response(request, 'pages/500.html', status=500)
 
 
 def csrf_failure(request, reason=''):
     """Кастомная страница для ошибки 403."""
-    return render(request, 'pages/403csrf.html', status=403)
+    return error_response(request, 'pages/403csrf.html', status=403)
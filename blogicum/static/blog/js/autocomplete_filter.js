@@ -0,0 +1,14 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    $(function() {
+        $('select[data-filter-lookup]').on('change', function() {
+            const params = new URLSearchParams(window.location.search);
+            params.delete('p');
+            params.delete(this.dataset.filterIsnull);
+            params.set(this.dataset.filterLookup, this.value);
+            window.location.search = params.toString();
+        });
+    });
+}
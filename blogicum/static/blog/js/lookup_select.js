@@ -0,0 +1,42 @@
+'use strict';
+{
+    const DELAY = 250;
+
+    const fill = function(select, results) {
+        const selected = select.value;
+        Array.from(select.options).forEach(option => {
+            if (option.value && option.value !== selected) {
+                option.remove();
+            }
+        });
+        results.forEach(result => {
+            const value = String(result.id);
+            if (value !== selected) {
+                select.add(new Option(result.text, value));
+            }
+        });
+    };
+
+    const init = function(select) {
+        const search = document.createElement('input');
+        search.type = 'search';
+        search.className = 'form-control mb-1';
+        search.placeholder = 'Поиск';
+        select.before(search);
+        let timer;
+        search.addEventListener('input', function() {
+            clearTimeout(timer);
+            timer = setTimeout(function() {
+                const url = select.dataset.lookupUrl
+                    + '?q=' + encodeURIComponent(search.value);
+                fetch(url, {credentials: 'same-origin'})
+                    .then(response => response.json())
+                    .then(data => fill(select, data.results));
+            }, DELAY);
+        });
+    };
+
+    document.addEventListener('DOMContentLoaded', function() {
+        document.querySelectorAll('select[data-lookup-url]').forEach(init);
+    });
+}
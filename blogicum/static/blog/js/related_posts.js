@@ -0,0 +1,29 @@
+'use strict';
+{
+    const load = function(details, query) {
+        const panel = details.querySelector('.related-posts');
+        fetch(details.dataset.relatedPosts + query, {credentials: 'same-origin'})
+            .then(response => response.text())
+            .then(html => {
+                panel.innerHTML = html;
+            });
+    };
+
+    document.addEventListener('DOMContentLoaded', function() {
+        document.querySelectorAll('details[data-related-posts]').forEach(details => {
+            details.addEventListener('toggle', function() {
+                if (details.open && !details.dataset.loaded) {
+                    details.dataset.loaded = 'true';
+                    load(details, '');
+                }
+            });
+            details.addEventListener('click', function(event) {
+                const link = event.target.closest('.paginator a');
+                if (link) {
+                    event.preventDefault();
+                    load(details, link.getAttribute('href'));
+                }
+            });
+        });
+    });
+}
@@ -1,6 +1,7 @@
 import os
 import re
 import time
+from datetime import timedelta
 from http import HTTPStatus
 from inspect import getsource
 from pathlib import Path
@@ -19,11 +20,13 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -41,6 +44,14 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def flush_view_counts_immediately():
+    # Иначе просмотры копятся до выхода из процесса, когда тестовой БД
+    # уже нет.
+    with override_settings(VIEW_COUNTS_FLUSH_INTERVAL=0):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -133,6 +144,47 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    """Опубликованный пост user; поля можно переопределить."""
+    def make_post(title, **fields):
+        return mixer.blend('blog.Post', **{
+            'title': title,
+            'author': user,
+            'category': published_category,
+            'location': None,
+            'is_published': True,
+            'pub_date': timezone.now() - timedelta(days=1),
+            **fields,
+        })
+    return make_post
+
+
+@pytest.fixture
+def make_posts_with_comments(mixer):
+    """count постов с comments_per_post комментариями commenter."""
+    def make_posts_with_comments(
+            count, comments_per_post, commenter, **post_fields):
+        posts = mixer.cycle(count).blend('blog.Post', **post_fields)
+        for post in posts:
+            mixer.cycle(comments_per_post).blend(
+                'blog.Comment', post=post, author=commenter
+            )
+        return posts
+    return make_posts_with_comments
+
+
+def fts_rows(post_ids):
+    """Число строк полнотекстового индекса SQLite для постов post_ids."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT COUNT(*) FROM blog_post_fts WHERE rowid IN '
+            f'({", ".join(["%s"] * len(post_ids))})',
+            post_ids,
+        )
+        return cursor.fetchone()[0]
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg
 ):
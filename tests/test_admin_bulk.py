@@ -0,0 +1,122 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.test import override_settings
+
+from blog.models import AutocompleteTerm, Comment, Post
+from conftest import fts_rows
+
+CHANGELIST_URL = '/admin/blog/post/'
+
+
+@pytest.fixture
+def spam_posts(mixer, user, make_posts_with_comments):
+    return make_posts_with_comments(
+        5, 3, user,
+        author=user,
+        category=mixer.blend('blog.Category', is_published=True),
+        is_published=True,
+        title=mixer.sequence('spam post {0}'),
+    )
+
+
+def run_action(client, action, posts=(), url=CHANGELIST_URL, **data):
+    return client.post(url, {
+        'action': action,
+        'index': 0,
+        '_selected_action': [post.id for post in posts],
+        **data,
+    })
+
+
+@pytest.mark.django_db
+@override_settings(ADMIN_BULK_CHUNK_SIZE=2)
+def test_publish_and_unpublish_actions(admin_client, spam_posts):
+    selected = spam_posts[:3]
+    run_action(admin_client, 'unpublish', selected)
+    assert set(
+        Post.objects.filter(is_published=False).values_list('id', flat=True)
+    ) == {post.id for post in selected}, (
+        'Убедитесь, что действие снимает с публикации все выбранные посты '
+        'и только их.'
+    )
+    run_action(admin_client, 'publish', selected)
+    assert not Post.objects.filter(is_published=False).exists()
+
+
+@pytest.mark.django_db
+@override_settings(ADMIN_BULK_CHUNK_SIZE=2)
+def test_move_to_category_action(admin_client, mixer, spam_posts):
+    target = mixer.blend('blog.Category', is_published=True)
+    selected = spam_posts[:3]
+    response = run_action(admin_client, 'move_to_category', selected)
+    assert response.status_code == 200
+    assert 'name="category"' in response.content.decode(), (
+        'Убедитесь, что перенос сначала показывает форму выбора категории.'
+    )
+    assert not Post.objects.filter(category=target).exists()
+
+    run_action(
+        admin_client, 'move_to_category', selected,
+        apply=1, category=target.id,
+    )
+    assert set(
+        Post.objects.filter(category=target).values_list('id', flat=True)
+    ) == {post.id for post in selected}
+
+
+@pytest.mark.django_db
+@override_settings(ADMIN_BULK_CHUNK_SIZE=2)
+def test_delete_with_comments_across_filtered_list(
+        admin_client, mixer, spam_posts):
+    kept = mixer.blend('blog.Post', title='kept post')
+    mixer.blend('blog.Comment', post=kept)
+    post_ids = [post.id for post in spam_posts]
+    url = f'{CHANGELIST_URL}?category__id__exact={spam_posts[0].category_id}'
+    assert fts_rows(post_ids) == len(post_ids)
+    assert AutocompleteTerm.objects.filter(
+        kind=AutocompleteTerm.POST, object_id__in=post_ids
+    ).exists()
+
+    response = run_action(
+        admin_client, 'delete_with_comments', spam_posts[:1], url=url,
+        select_across=1,
+    )
+    assert response.status_code == 200
+    assert Post.objects.filter(id__in=post_ids).count() == len(post_ids), (
+        'Убедитесь, что удаление ждёт подтверждения.'
+    )
+
+    run_action(
+        admin_client, 'delete_with_comments', spam_posts[:1], url=url,
+        select_across=1, apply=1,
+    )
+    assert not Post.objects.filter(id__in=post_ids).exists(), (
+        'Убедитесь, что при выборе всех строк удаляются все посты, '
+        'подходящие под фильтры списка.'
+    )
+    assert not Comment.objects.filter(post_id__in=post_ids).exists()
+    assert not AutocompleteTerm.objects.filter(
+        kind=AutocompleteTerm.POST, object_id__in=post_ids
+    ).exists(), 'Убедитесь, что удаляются слова автодополнения постов.'
+    assert fts_rows(post_ids) == 0, (
+        'Убедитесь, что удаляются строки полнотекстового индекса.'
+    )
+    assert Post.objects.filter(id=kept.id).exists()
+    assert Comment.objects.filter(post=kept).exists()
+
+
+@pytest.mark.django_db
+def test_delete_with_comments_requires_comment_permission(
+        client, mixer, spam_posts):
+    staff = mixer.blend('auth.User', is_staff=True)
+    staff.user_permissions.add(*Permission.objects.filter(
+        codename__in=('view_post', 'delete_post')
+    ))
+    client.force_login(staff)
+    run_action(client, 'delete_with_comments', spam_posts, apply=1)
+    assert Post.objects.filter(
+        id__in=[post.id for post in spam_posts]
+    ).count() == len(spam_posts), (
+        'Убедитесь, что без права на удаление комментариев посты '
+        'с комментариями не удаляются.'
+    )
@@ -0,0 +1,39 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.test import Client
+
+
+@pytest.fixture
+def staff_client(user):
+    user.is_staff = True
+    user.save()
+    user.user_permissions.add(
+        Permission.objects.get(codename='view_category')
+    )
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_related_posts_need_post_permission(
+        staff_client, user, post_with_published_location):
+    category = post_with_published_location.category
+    change_url = f'/admin/blog/category/{category.pk}/change/'
+    posts_url = f'/admin/blog/category/{category.pk}/posts/'
+    assert 'data-related-posts' not in (
+        staff_client.get(change_url).content.decode('utf-8')
+    )
+    assert staff_client.get(posts_url).status_code == 403, (
+        'Убедитесь, что список постов объекта в админке недоступен '
+        'без права на просмотр постов.'
+    )
+    user.user_permissions.add(Permission.objects.get(codename='view_post'))
+    assert 'data-related-posts' in (
+        staff_client.get(change_url).content.decode('utf-8')
+    )
+    response = staff_client.get(posts_url)
+    assert response.status_code == 200
+    assert post_with_published_location.title in (
+        response.content.decode('utf-8')
+    )
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.autocomplete import suggest
+from blog.models import AutocompleteTerm, User
+
+
+def terms(kind, instance):
+    return set(
+        AutocompleteTerm.objects
+        .filter(kind=kind, object_id=instance.pk)
+        .values_list('term', flat=True)
+    )
+
+
+def labels(results):
+    return [item['label'] for item in results]
+
+
+@pytest.mark.django_db
+def test_index_follows_saves_and_deletes(make_post, mixer):
+    post = make_post('Старый Маяк')
+    assert terms(AutocompleteTerm.POST, post) == {'старый', 'маяк'}
+    post.title = 'Новый маяк'
+    post.save()
+    assert terms(AutocompleteTerm.POST, post) == {'новый', 'маяк'}, (
+        'Убедитесь, что слова автодополнения обновляются при сохранении.'
+    )
+    post.delete()
+    assert not terms(AutocompleteTerm.POST, post)
+    user = mixer.blend(User, username='Капитан')
+    assert terms(AutocompleteTerm.USER, user) == {'капитан'}
+
+
+@pytest.mark.django_db
+def test_suggest_skips_hidden_before_limit(make_post):
+    for number in range(10):
+        make_post(f'Альфа {number}', is_published=False)
+    make_post(
+        'Альфа в будущем', pub_date=timezone.now() + timedelta(days=1)
+    )
+    visible = make_post('Альфа видимая')
+    assert suggest('альф', 2) == [{
+        'kind': AutocompleteTerm.POST,
+        'label': 'Альфа видимая',
+        'url': f'/posts/{visible.pk}/',
+    }], (
+        'Убедитесь, что скрытые посты не занимают места в подсказках.'
+    )
+
+
+@pytest.mark.django_db
+def test_suggest_matches_every_word_once(make_post):
+    make_post('Кот котик котёнок')
+    make_post('Большой кот')
+    make_post('Маленький кот')
+    assert labels(suggest('ко', 2)) == ['Большой кот', 'Кот котик котёнок'], (
+        'Убедитесь, что каждый объект попадает в подсказки один раз.'
+    )
+    assert labels(suggest('БОЛ ко', 10)) == ['Большой кот']
+    assert labels(suggest('ольшой ко', 10)) == []
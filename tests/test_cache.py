@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from django.test import override_settings
+
+from blog.cache import (
+    acquire_lock, get_cache, get_or_compute, invalidate, lock_path, make_key,
+    release_lock, version_key
+)
+from blog.forms import BlogForm
+from blog.models import Category
+
+
+@pytest.fixture
+def blog_cache(tmp_path):
+    with override_settings(
+        CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+            'blog': {
+                'BACKEND': (
+                    'django.core.cache.backends.filebased.FileBasedCache'
+                ),
+                'LOCATION': tmp_path / 'cache',
+                'TIMEOUT': 1,
+            },
+        },
+        BLOG_CACHE_LOCK_DIR=tmp_path / 'cache' / 'locks',
+        BLOG_CACHE_LOCK_TIMEOUT=0.2,
+    ):
+        yield get_cache()
+
+
+def test_get_or_compute_until_invalidated(blog_cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert get_or_compute('categories', ('choices',), compute) == 1
+    assert get_or_compute('categories', ('choices',), compute) == 1
+    invalidate('categories')
+    assert get_or_compute('categories', ('choices',), compute) == 2, (
+        'Убедитесь, что после invalidate() значение пересчитывается.'
+    )
+    assert get_or_compute('locations', ('choices',), compute) == 3
+
+
+def test_version_outlives_cached_values(blog_cache):
+    get_or_compute('categories', ('choices',), lambda: 'cached')
+    invalidate('categories')
+    key = make_key('categories', 'choices')
+    blog_cache.set(key, 'cached')
+    time.sleep(1.1)
+    assert blog_cache.get(version_key('categories')) == 2, (
+        'Убедитесь, что версия семейства не истекает по TIMEOUT кэша.'
+    )
+    assert blog_cache.get(key) is None, (
+        'Убедитесь, что закэшированные значения имеют конечный срок жизни.'
+    )
+
+
+def test_compute_lock(blog_cache):
+    path = lock_path(make_key('categories', 'choices'))
+    assert acquire_lock(path)
+    assert not acquire_lock(path), (
+        'Убедитесь, что блокировку пересчёта нельзя взять дважды.'
+    )
+    # Пока блокировка занята, значение вычисляется только по истечении
+    # BLOG_CACHE_LOCK_TIMEOUT, и тогда же брошенная блокировка
+    # перехватывается.
+    assert get_or_compute('categories', ('choices',), lambda: 'value') == (
+        'value'
+    )
+    time.sleep(0.2)
+    assert acquire_lock(path)
+    release_lock(path)
+    assert acquire_lock(path)
+
+
+@pytest.mark.django_db
+def test_choices_follow_category_saves(blog_cache, mixer):
+    def choices():
+        return [
+            label for value, label in BlogForm().fields['category'].choices
+            if value
+        ]
+
+    category = mixer.blend(Category, title='Море', is_published=True)
+    assert choices() == ['Море']
+    mixer.blend(Category, title='Горы', is_published=True)
+    assert sorted(choices()) == ['Горы', 'Море'], (
+        'Убедитесь, что кэш вариантов сбрасывается при сохранении категории.'
+    )
+    category.is_published = False
+    category.save()
+    assert choices() == ['Горы']
+    Category.objects.filter(title='Горы').delete()
+    assert choices() == []
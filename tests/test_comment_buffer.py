@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+from django.db import DatabaseError
+from django.test import override_settings
+
+from blog.comment_buffer import CommentBuffer
+from blog.models import Comment
+
+
+@pytest.fixture
+def make_comment(post_with_published_location, user):
+    def make_comment(text='Комментарий'):
+        return Comment(
+            text=text, post=post_with_published_location, author=user
+        )
+    return make_comment
+
+
+@pytest.mark.django_db
+@override_settings(COMMENT_BATCH_SIZE=2, COMMENT_FLUSH_INTERVAL=60)
+def test_flush_when_batch_is_full(make_comment):
+    buffer = CommentBuffer()
+    buffer.add(make_comment())
+    assert not Comment.objects.exists()
+    buffer.add(make_comment())
+    assert Comment.objects.count() == 2, (
+        'Убедитесь, что полная пачка комментариев записывается сразу.'
+    )
+    assert buffer._timer is None
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(COMMENT_BATCH_SIZE=50, COMMENT_FLUSH_INTERVAL=0.05)
+def test_flush_by_timer(make_comment):
+    buffer = CommentBuffer()
+    buffer.add(make_comment())
+    timer = buffer._timer
+    timer.join(timeout=5)
+    assert Comment.objects.count() == 1, (
+        'Убедитесь, что комментарии записываются через '
+        'COMMENT_FLUSH_INTERVAL секунд.'
+    )
+
+
+@pytest.mark.django_db
+@override_settings(COMMENT_BATCH_SIZE=50, COMMENT_FLUSH_INTERVAL=60)
+def test_failed_flush_keeps_comments(make_comment, monkeypatch, caplog):
+    buffer = CommentBuffer()
+    buffer.add(make_comment())
+
+    def fail(*args, **kwargs):
+        raise DatabaseError('database is locked')
+
+    logger = logging.getLogger('blog.comments')
+    logger.addHandler(caplog.handler)
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(Comment.objects, 'bulk_create', fail)
+            assert buffer.flush() == []
+    finally:
+        logger.removeHandler(caplog.handler)
+    assert 'database is locked' in caplog.text
+    assert buffer._timer is not None
+    assert len(buffer.flush()) == 1, (
+        'Убедитесь, что после ошибки записи комментарии остаются '
+        'в буфере и записываются следующим сбросом.'
+    )
+    assert Comment.objects.count() == 1
@@ -0,0 +1,85 @@
+import sqlite3
+
+import pytest
+from django.db import connection
+
+from blogicum.db.pool import is_raw_connection_usable, pools
+from blogicum.db.sqlite3.base import DatabaseWrapper, apply_pragmas
+
+
+def pragma(cursor, name):
+    cursor.execute(f'PRAGMA {name}')
+    return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_connection():
+    with connection.cursor() as cursor:
+        assert pragma(cursor, 'busy_timeout') == 5000, (
+            'Убедитесь, что PRAGMA из DATABASES применяются '
+            'к каждому новому соединению.'
+        )
+        assert pragma(cursor, 'synchronous') == 1
+        assert pragma(cursor, 'temp_store') == 2
+        assert pragma(cursor, 'cache_size') == -20000
+
+
+def test_apply_pragmas_enables_wal(tmp_path):
+    raw_connection = sqlite3.connect(tmp_path / 'db.sqlite3')
+    try:
+        apply_pragmas(raw_connection, {'journal_mode': 'WAL'})
+        assert pragma(raw_connection.cursor(), 'journal_mode') == 'wal'
+    finally:
+        raw_connection.close()
+
+
+@pytest.fixture
+def pooled_wrapper(tmp_path):
+    wrapper = DatabaseWrapper({
+        **connection.settings_dict,
+        'NAME': str(tmp_path / 'pooled.sqlite3'),
+        'POOL_SIZE': 1,
+        'CONN_HEALTH_CHECKS': True,
+    }, alias='pooled')
+    yield wrapper
+    wrapper.close()
+    for key in [key for key in pools if key[0] == 'pooled']:
+        pools.pop(key).drain()
+
+
+@pytest.mark.django_db
+def test_pool_reuses_connection(pooled_wrapper):
+    pooled_wrapper.ensure_connection()
+    raw_connection = pooled_wrapper.connection
+    pooled_wrapper.close()
+    assert is_raw_connection_usable(raw_connection), (
+        'Убедитесь, что закрытое соединение возвращается в пул открытым.'
+    )
+    pooled_wrapper.ensure_connection()
+    assert pooled_wrapper.connection is raw_connection
+
+
+@pytest.mark.django_db
+def test_pool_health_check_drops_broken_connection(pooled_wrapper):
+    pooled_wrapper.ensure_connection()
+    raw_connection = pooled_wrapper.connection
+    pooled_wrapper.close()
+    raw_connection.close()
+    assert not is_raw_connection_usable(raw_connection)
+    pooled_wrapper.ensure_connection()
+    assert pooled_wrapper.connection is not raw_connection
+    assert is_raw_connection_usable(pooled_wrapper.connection)
+
+
+@pytest.mark.django_db
+def test_pool_keyed_by_connection_settings(pooled_wrapper, tmp_path):
+    pooled_wrapper.ensure_connection()
+    raw_connection = pooled_wrapper.connection
+    pooled_wrapper.close()
+    pooled_wrapper.settings_dict['NAME'] = str(tmp_path / 'other.sqlite3')
+    pooled_wrapper.ensure_connection()
+    assert pooled_wrapper.connection is not raw_connection, (
+        'Убедитесь, что после смены NAME пул не отдаёт соединение '
+        'со старой БД.'
+    )
+    assert not is_raw_connection_usable(raw_connection)
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.core.management import CommandError, call_command
+from django.test import Client, override_settings
+from django.utils import timezone
+
+import blog.deletion
+from blog.deletion import create_job, run_job, schedule_deletion
+from blog.models import AutocompleteTerm, Comment, DeletionJob, Post, User
+from conftest import fts_rows
+
+
+@pytest.fixture
+def author_with_posts(mixer, user, another_user, make_posts_with_comments):
+    make_posts_with_comments(3, 2, another_user, author=user)
+    other_post, = make_posts_with_comments(1, 2, user, author=another_user)
+    mixer.blend('blog.Comment', post=other_post, author=another_user)
+    return user
+
+
+def assert_user_deleted(user, post_ids):
+    assert not User.objects.filter(id=user.id).exists()
+    assert not Post.objects.filter(id__in=post_ids).exists()
+    assert not Comment.objects.filter(author_id=user.id).exists(), (
+        'Убедитесь, что удаляются комментарии пользователя.'
+    )
+    assert not Comment.objects.filter(post_id__in=post_ids).exists(), (
+        'Убедитесь, что удаляются комментарии к постам пользователя.'
+    )
+    assert not AutocompleteTerm.objects.filter(
+        kind=AutocompleteTerm.POST, object_id__in=post_ids
+    ).exists()
+    assert fts_rows(post_ids) == 0
+
+
+@pytest.mark.django_db
+@override_settings(DELETION_IN_BACKGROUND=False, DELETION_CHUNK_SIZE=2)
+def test_schedule_deletion_removes_user_and_children(
+        author_with_posts, another_user):
+    user = author_with_posts
+    post_ids = list(user.posts.values_list('id', flat=True))
+
+    job = schedule_deletion(user)
+
+    assert job.status == DeletionJob.DONE
+    # 6 + 2 комментария, 3 поста и сам пользователь.
+    assert job.deleted_rows == 12
+    assert_user_deleted(user, post_ids)
+    assert Post.objects.filter(author=another_user).exists()
+    assert Comment.objects.filter(author=another_user).count() == 1
+
+
+@pytest.mark.django_db
+@override_settings(DELETION_CHUNK_SIZE=2)
+def test_run_job_resumes_after_failure(author_with_posts, monkeypatch):
+    user = author_with_posts
+    post_ids = list(user.posts.values_list('id', flat=True))
+    job = create_job(user)
+    assert not User.objects.get(id=user.id).is_active
+
+    def fail(post_ids):
+        raise RuntimeError('db is gone')
+
+    monkeypatch.setattr(blog.deletion, 'delete_posts', fail)
+    job = run_job(job.id)
+    assert job.status == DeletionJob.FAILED
+    assert 'db is gone' in job.error
+    assert job.deleted_rows == 8, (
+        'Убедитесь, что пакеты до сбоя остаются удалёнными.'
+    )
+    assert Post.objects.filter(id__in=post_ids).count() == 3
+
+    monkeypatch.undo()
+    job = run_job(job.id)
+    assert job.status == DeletionJob.DONE, (
+        'Убедитесь, что повторный запуск продолжает прерванную задачу.'
+    )
+    assert job.deleted_rows == 12
+    assert_user_deleted(user, post_ids)
+
+
+@pytest.mark.django_db
+def test_process_deletions_command(author_with_posts, mixer):
+    post = mixer.blend('blog.Post')
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    user = author_with_posts
+    post_ids = list(user.posts.values_list('id', flat=True))
+    pending = create_job(user)
+
+    call_command('process_deletions', post=[post.id])
+
+    assert not Post.objects.filter(id=post.id).exists()
+    assert not Comment.objects.filter(post_id=post.id).exists()
+    pending.refresh_from_db()
+    assert pending.status == DeletionJob.DONE, (
+        'Убедитесь, что команда завершает ранее созданные задачи.'
+    )
+    assert_user_deleted(user, post_ids)
+    with pytest.raises(CommandError):
+        call_command('process_deletions', user=['nobody'])
+
+
+@pytest.mark.django_db
+@override_settings(DELETION_IN_BACKGROUND=False)
+def test_admin_user_delete_requires_related_permissions(
+        author_with_posts, mixer):
+    user = author_with_posts
+    staff = mixer.blend('auth.User', is_staff=True)
+    staff.user_permissions.add(*Permission.objects.filter(
+        codename__in=('view_user', 'delete_user')
+    ))
+    client = Client()
+    client.force_login(staff)
+
+    response = client.post(
+        f'/admin/auth/user/{user.id}/delete/', {'post': 'yes'}
+    )
+
+    assert response.status_code == 403, (
+        'Убедитесь, что для удаления пользователя нужны права на удаление '
+        'его постов и комментариев.'
+    )
+    assert User.objects.filter(id=user.id).exists()
+    assert not DeletionJob.objects.exists()
+
+    staff.user_permissions.add(*Permission.objects.filter(
+        codename__in=('delete_post', 'delete_comment')
+    ))
+    client.post(f'/admin/auth/user/{user.id}/delete/', {'post': 'yes'})
+    assert not User.objects.filter(id=user.id).exists()
+
+
+@pytest.mark.django_db
+@override_settings(DELETION_STALE_SECONDS=60)
+def test_process_deletions_skips_running_jobs(author_with_posts, mixer):
+    user = author_with_posts
+    post_ids = list(user.posts.values_list('id', flat=True))
+    post = mixer.blend('blog.Post')
+    running = create_job(user)
+    stale = create_job(post)
+    DeletionJob.objects.filter(pk=running.pk).update(
+        status=DeletionJob.RUNNING, updated_at=timezone.now()
+    )
+    DeletionJob.objects.filter(pk=stale.pk).update(
+        status=DeletionJob.RUNNING,
+        updated_at=timezone.now() - timedelta(minutes=5),
+    )
+
+    call_command('process_deletions')
+
+    running.refresh_from_db()
+    assert running.status == DeletionJob.RUNNING, (
+        'Убедитесь, что команда не запускает задачу, которую выполняет '
+        'другой процесс.'
+    )
+    assert User.objects.filter(pk=user.pk).exists()
+    assert Post.objects.filter(pk__in=post_ids).count() == len(post_ids)
+    stale.refresh_from_db()
+    assert stale.status == DeletionJob.DONE, (
+        'Убедитесь, что команда продолжает брошенные задачи.'
+    )
+    assert not Post.objects.filter(pk=post.pk).exists()
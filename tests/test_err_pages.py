@@ -122,3 +122,13 @@ def test_custom_err_handlers(client, user_client):
     )
 
     settings.DEBUG = debug
+
+
+@pytest.mark.django_db
+def test_404_page_without_queries(user_client, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        response = user_client.get(f'/{uuid.uuid4()}/')
+    assert response.status_code == 404
+    content = response.content.decode('utf-8')
+    assert 'Войти' not in content
+    assert 'Выйти' not in content
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog.concurrency import fan_out, get_executor
+from blog.models import Category
+from blogicum.middleware import InstrumentationMiddleware
+
+
+def _fan_out_view(request):
+    Category.objects.count()
+    fan_out(Category.objects.count, Category.objects.count)
+    return HttpResponse()
+
+
+@pytest.fixture
+def own_executor():
+    # Потоки пула держат свои соединения: после теста они не должны
+    # достаться тестам без доступа к БД.
+    get_executor.cache_clear()
+    yield
+    get_executor().shutdown()
+    get_executor.cache_clear()
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(INSTRUMENTATION_SAMPLE_RATE=1, QUERY_FAN_OUT=True)
+def test_fan_out_queries_counted(own_executor):
+    middleware = InstrumentationMiddleware(_fan_out_view)
+    response = middleware(RequestFactory().get('/'))
+    assert 'desc="3 queries"' in response['Server-Timing'], (
+        'Убедитесь, что запросы из потоков fan_out учитываются '
+        'в Server-Timing.'
+    )
+
+
+async def _async_view(request):
+    return HttpResponse()
+
+
+@override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+def test_instrumentation_async():
+    middleware = InstrumentationMiddleware(_async_view)
+    assert asyncio.iscoroutinefunction(middleware)
+    response = asyncio.run(middleware(RequestFactory().get('/')))
+    assert 'total;dur=' in response['Server-Timing']
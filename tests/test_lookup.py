@@ -0,0 +1,53 @@
+import pytest
+
+from blog.forms import BlogForm
+
+
+@pytest.mark.django_db
+def test_lookup_matches_cyrillic_prefix_in_any_case(client, mixer):
+    location = mixer.blend(
+        'blog.Location', name='Москва', is_published=True
+    )
+    mixer.blend('blog.Location', name='Мостар', is_published=False)
+    for query in ('мос', 'МОС'):
+        response = client.get('/lookup/location/', {'q': query})
+        assert response.json()['results'] == [
+            {'id': location.id, 'text': 'Москва'}
+        ], (
+            'Убедитесь, что поиск местоположений не зависит от регистра '
+            'и возвращает только опубликованные.'
+        )
+
+
+@pytest.mark.django_db
+def test_admin_category_search_by_prefix(admin_client, mixer):
+    category = mixer.blend(
+        'blog.Category', title='Путешествия по России', is_published=True
+    )
+    mixer.blend('blog.Category', title='Спорт', is_published=True)
+    response = admin_client.get('/admin/autocomplete/', {
+        'app_label': 'blog',
+        'model_name': 'post',
+        'field_name': 'category',
+        'term': 'РОС',
+    })
+    assert [item['id'] for item in response.json()['results']] == [
+        str(category.pk)
+    ], (
+        'Убедитесь, что поиск категорий в админке идёт по префиксам '
+        'слов без учёта регистра.'
+    )
+    response = admin_client.get('/admin/blog/category/', {'q': 'пут рос'})
+    assert list(response.context['cl'].result_list) == [category]
+
+
+@pytest.mark.django_db
+def test_lookup_select_renders_selected_from_cache(
+        post_with_published_location, django_assert_num_queries):
+    post = post_with_published_location
+    BlogForm(instance=post).as_p()
+    with django_assert_num_queries(0):
+        html = BlogForm(instance=post).as_p()
+    assert f'<option value="{post.category.pk}" selected>' in html, (
+        'Убедитесь, что выбранная категория берётся из кэша вариантов.'
+    )
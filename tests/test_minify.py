@@ -0,0 +1,31 @@
+import pytest
+from django.test import override_settings
+
+from blogicum.middleware import minify_html
+
+
+def test_minify_html_keeps_attribute_values():
+    html = (
+        '<input  type="text"\n   value="a  b" title=\'x   y\'>\n\n'
+        '<p>text    with   spaces</p>  <pre>  keep   </pre>'
+    )
+    assert minify_html(html) == (
+        '<input type="text"\nvalue="a  b" title=\'x   y\'>\n'
+        '<p>text with spaces</p> <pre>  keep   </pre>'
+    ), (
+        'Убедитесь, что минификация схлопывает пробелы только вне '
+        'значений атрибутов и блоков pre/textarea/script/style.'
+    )
+
+
+@pytest.mark.django_db
+@override_settings(HTML_MINIFY=True)
+def test_edit_post_form_keeps_title_spaces(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    post.title = 'a  b'
+    post.save()
+    response = user_client.get(f'/posts/{post.id}/edit/')
+    assert 'value="a  b"' in response.content.decode(), (
+        'Убедитесь, что минификация HTML не меняет значения полей формы.'
+    )
@@ -369,3 +369,15 @@ def _test_edit_post(
         **update_props,
     )
     return edit_response, edit_url, del_url
+
+
+@pytest.mark.django_db
+def test_delete_post_page_loads_post_once(
+        user_client, post_with_published_location, django_assert_num_queries):
+    delete_url = f'/posts/{post_with_published_location.id}/delete/'
+    # Пользователь сессии и пост (вместе с location, category и author).
+    with django_assert_num_queries(2):
+        response = user_client.get(delete_url)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что автор поста может открыть страницу его удаления.'
+    )
@@ -0,0 +1,106 @@
+import asyncio
+
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog.concurrency import fan_out
+from blog.streaming import render_stream
+from blogicum.middleware import PrimaryPinMiddleware
+from blogicum.routers import PrimaryReplicaRouter, primary_pinned
+from blog.models import Post
+
+
+def _read_db_during_request(request):
+    router = PrimaryReplicaRouter()
+    response = HttpResponse()
+    response.read_db = router.db_for_read(Post)
+    return response
+
+
+@override_settings(
+    REPLICA_DATABASES=['replica_1'],
+    REPLICA_PIN_COOKIE='primary_pin',
+    REPLICA_PIN_SECONDS=5,
+)
+def test_replica_router_and_primary_pin():
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Post) == 'replica_1', (
+        'Убедитесь, что чтение без записи направляется в реплику.'
+    )
+    assert router.db_for_write(Post) == 'default'
+    assert router.allow_migrate('default', 'blog')
+    assert not router.allow_migrate('replica_1', 'blog')
+
+    middleware = PrimaryPinMiddleware(_read_db_during_request)
+    factory = RequestFactory()
+
+    response = middleware(factory.post('/posts/create/'))
+    assert response.read_db == 'default', (
+        'Убедитесь, что при записи чтение идёт из основной БД.'
+    )
+    assert response.cookies['primary_pin']['max-age'] == 5
+
+    request = factory.get('/')
+    request.COOKIES['primary_pin'] = '1'
+    assert middleware(request).read_db == 'default', (
+        'Убедитесь, что после записи автор читает из основной БД.'
+    )
+    assert middleware(factory.get('/')).read_db == 'replica_1'
+    assert primary_pinned.get() is False
+
+
+@override_settings(REPLICA_DATABASES=['replica_1'], QUERY_FAN_OUT=True)
+def test_fan_out_keeps_primary_pin():
+    router = PrimaryReplicaRouter()
+    token = primary_pinned.set(True)
+    try:
+        assert fan_out(
+            lambda: router.db_for_read(Post),
+            lambda: router.db_for_read(Post),
+        ) == ['default', 'default'], (
+            'Убедитесь, что параллельные запросы видят закрепление '
+            'за основной БД.'
+        )
+    finally:
+        primary_pinned.reset(token)
+
+
+@override_settings(REPLICA_DATABASES=['replica_1'])
+def test_stream_keeps_primary_pin():
+    router = PrimaryReplicaRouter()
+    read_dbs = []
+
+    def items():
+        read_dbs.append(router.db_for_read(Post))
+        yield None
+
+    token = primary_pinned.set(True)
+    try:
+        response = render_stream(
+            RequestFactory().get('/'), 'blog/index.html', {},
+            items(), 'item', 'includes/footer.html',
+        )
+    finally:
+        primary_pinned.reset(token)
+    assert '© Блогикум' in b''.join(response.streaming_content).decode()
+    assert read_dbs == ['default'], (
+        'Убедитесь, что элементы потоковой страницы читаются с учётом '
+        'закрепления за основной БД.'
+    )
+
+
+async def _async_read_db(request):
+    return _read_db_during_request(request)
+
+
+@override_settings(
+    REPLICA_DATABASES=['replica_1'],
+    REPLICA_PIN_COOKIE='primary_pin',
+    REPLICA_PIN_SECONDS=5,
+)
+def test_primary_pin_async():
+    middleware = PrimaryPinMiddleware(_async_read_db)
+    assert asyncio.iscoroutinefunction(middleware)
+    response = asyncio.run(middleware(RequestFactory().post('/')))
+    assert response.read_db == 'default'
+    assert response.cookies['primary_pin']['max-age'] == 5
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from blog.search import SQLITE_TABLE
+
+
+def search(client, query, page=None):
+    params = {'q': query}
+    if page:
+        params['page'] = page
+    response = client.get('/search/', params)
+    assert response.status_code == 200
+    return response
+
+
+def found(client, query):
+    return [post.pk for post in search(client, query).context['page_obj']]
+
+
+@pytest.mark.django_db
+def test_search_ranks_best_match_first(client, make_post):
+    strong = make_post(
+        'Кот', text='Кот, ещё кот и снова кот.',
+        pub_date=timezone.now() - timedelta(days=2),
+    )
+    weak = make_post(
+        'Заметки', text='Сегодня видел кота. ' + 'Шёл дождь. ' * 20
+    )
+    make_post('Лес', text='Никого нет.')
+    assert found(client, 'кот') == [strong.pk, weak.pk], (
+        'Убедитесь, что результаты поиска упорядочены по релевантности.'
+    )
+
+
+@pytest.mark.django_db
+def test_search_hides_unpublished(client, make_post, mixer):
+    visible = make_post('Маяк', text='Маяк на берегу.')
+    make_post('Маяк снят', text='Маяк.', is_published=False)
+    make_post(
+        'Маяк в будущем', text='Маяк.',
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    make_post(
+        'Маяк в скрытой категории', text='Маяк.',
+        category=mixer.blend('blog.Category', is_published=False),
+    )
+    assert found(client, 'маяк') == [visible.pk], (
+        'Убедитесь, что поиск не показывает неопубликованные посты.'
+    )
+
+
+@pytest.mark.django_db
+def test_search_pagination_keeps_query(client, make_post, settings):
+    for number in range(settings.PAGINATED_BY + 1):
+        make_post(f'Парус {number}', text='Парус.')
+    content = search(client, 'парус').content.decode('utf-8')
+    assert '?q=%D0%BF%D0%B0%D1%80%D1%83%D1%81&page=2' in content, (
+        'Убедитесь, что ссылки пагинации сохраняют поисковый запрос.'
+    )
+    assert len(search(client, 'парус', page=2).context['page_obj']) == 1
+
+
+def fts_row(post_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT title, text FROM {SQLITE_TABLE} WHERE rowid = %s',
+            [post_id],
+        )
+        return cursor.fetchone()
+
+
+@pytest.mark.django_db
+def test_search_index_follows_post_changes(client, make_post):
+    post = make_post('Глобус', text='Старый глобус.')
+    assert fts_row(post.pk) == ('Глобус', 'Старый глобус.')
+    post.title = 'Компас'
+    post.text = 'Новый компас.'
+    post.save()
+    assert fts_row(post.pk) == ('Компас', 'Новый компас.')
+    assert found(client, 'глобус') == []
+    assert found(client, 'компас') == [post.pk]
+    post.delete()
+    assert fts_row(post.pk) is None, (
+        'Убедитесь, что удалённый пост убирается из поискового индекса.'
+    )
+    assert found(client, 'компас') == []
@@ -0,0 +1,30 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def session_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'django_session' in query['sql'] or 'auth_user' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+def test_anonymous_request_skips_session(client):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get('/')
+    assert response.status_code == 200
+    assert not response.wsgi_request.session.accessed, (
+        'Убедитесь, что запрос без сессионной куки не загружает сессию.'
+    )
+    assert not session_queries(context)
+    assert settings.SESSION_COOKIE_NAME not in response.cookies
+
+
+@pytest.mark.django_db
+def test_logged_in_request_loads_user(user, user_client):
+    response = user_client.get('/')
+    assert response.wsgi_request.user == user
+    assert user.username in response.content.decode('utf-8')
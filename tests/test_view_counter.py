@@ -0,0 +1,34 @@
+import pytest
+from django.test import override_settings
+
+from blog.models import Post
+from blog.view_counter import ViewCounter
+
+
+@pytest.mark.django_db
+@override_settings(VIEW_COUNTS_BATCH_SIZE=2)
+def test_flush_adds_counts_per_post(mixer, django_assert_num_queries):
+    first, second, third, untouched = mixer.cycle(4).blend(
+        Post, views_count=5
+    )
+    counter = ViewCounter()
+    for post in (first, first, first, second, third):
+        counter.add(post.pk)
+    # Один UPDATE ... CASE на пачку из VIEW_COUNTS_BATCH_SIZE постов.
+    with django_assert_num_queries(2):
+        counts = counter.flush()
+    assert counts == {first.pk: 3, second.pk: 1, third.pk: 1}
+    assert dict(
+        Post.objects.order_by('pk').values_list('pk', 'views_count')
+    ) == {first.pk: 8, second.pk: 6, third.pk: 6, untouched.pk: 5}
+    assert not counter.flush()
+
+
+@pytest.mark.django_db
+def test_views_count_on_post_page(user_client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.pk}/'
+    user_client.get(url)
+    response = user_client.get(url)
+    assert 'Просмотров: 1' in response.content.decode('utf-8'), (
+        'Убедитесь, что на странице поста выводится число просмотров.'
+    )